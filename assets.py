@@ -0,0 +1,58 @@
+import os
+
+# Keep pygame's import banner out of headless tools and benchmarks
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+# === Lazy Assets ===
+# Nothing here touches the display, the mixer or the disk until it is first
+# asked for, so the game modules can be imported headless (tests, tools,
+# benchmarks) and only pay for what a front end actually uses.
+SCREEN_SIZE = (800, 600)
+CAPTION = "Pokémon Showdown"
+
+_display = None
+_mixer_ready = False
+_images = {}
+_fonts = {}
+
+
+def init_display(size=SCREEN_SIZE, caption=CAPTION):
+    global _display
+    if _display is None:
+        pygame.display.init()
+        _display = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+    return _display
+
+
+def init_mixer():
+    global _mixer_ready
+    if not _mixer_ready:
+        pygame.mixer.init()
+        _mixer_ready = True
+    return _mixer_ready
+
+
+def image(path, size=None):
+    key = (path, size)
+    surface = _images.get(key)
+    if surface is None:
+        surface = pygame.image.load(path)
+        if size is not None:
+            surface = pygame.transform.scale(surface, size)
+        if _display is not None:
+            surface = surface.convert()
+        _images[key] = surface
+    return surface
+
+
+def font(name, size):
+    key = (name, size)
+    loaded = _fonts.get(key)
+    if loaded is None:
+        pygame.font.init()
+        loaded = pygame.font.SysFont(name, size)
+        _fonts[key] = loaded
+    return loaded
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import assets
+
+
+# === Silent Backend ===
+# Stand-in used when there is no audio device, so the game runs without sound
+# instead of crashing on start.
+class SilentSound:
+    def play(self, *args, **kwargs):
+        pass
+
+    def stop(self):
+        pass
+
+    def set_volume(self, volume):
+        pass
+
+
+# === Audio Manager ===
+# Sound effects are decoded once, on a background thread, the first time they
+# are preloaded or played.  Background music is ducked or paused around
+# results rather than stopped and reloaded from the start.
+class AudioManager:
+    def __init__(self):
+        self.available = None
+        self.music_enabled = True
+        self.music_volume = 1.0
+        self.music_path = None
+        self._music_started = False
+        self._duck_level = 1.0
+        self._sounds = {}
+        self._decoder = None
+
+    def _ensure_mixer(self):
+        if self.available is None:
+            try:
+                assets.init_mixer()
+                self.available = True
+                self._decoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio")
+            except pygame.error as e:
+                print(f"Audio disabled: {e}")
+                self.available = False
+        return self.available
+
+    def preload(self, *paths):
+        if not self._ensure_mixer():
+            return
+        for path in paths:
+            if path not in self._sounds:
+                self._sounds[path] = self._decoder.submit(pygame.mixer.Sound, path)
+
+    def sound(self, path):
+        if not self._ensure_mixer():
+            return SilentSound()
+        self.preload(path)
+        try:
+            return self._sounds[path].result()
+        except Exception as e:
+            print(f"Failed to load sound {path}: {e}")
+            return SilentSound()
+
+    def play(self, path):
+        self.sound(path).play()
+
+    # === Background Music ===
+    def play_music(self, path, loops=-1):
+        self.music_path = path
+        if not self.music_enabled or not self._ensure_mixer():
+            return
+        pygame.mixer.music.load(path)
+        self._apply_volume()
+        pygame.mixer.music.play(loops)
+        self._music_started = True
+
+    def stop_music(self):
+        if self.available:
+            pygame.mixer.music.stop()
+            self._music_started = False
+
+    def pause_music(self):
+        if self.available:
+            pygame.mixer.music.pause()
+
+    def resume_music(self):
+        if not self.music_enabled or not self.available:
+            return
+        if self._music_started:
+            pygame.mixer.music.unpause()
+        elif self.music_path:
+            self.play_music(self.music_path)
+
+    # Turning music off pauses it, so turning it back on continues where it was
+    def set_music_enabled(self, enabled):
+        self.music_enabled = enabled
+        if enabled:
+            self._ensure_mixer()
+            self.resume_music()
+        else:
+            self.pause_music()
+
+    def set_music_volume(self, volume):
+        self.music_volume = max(0.0, min(1.0, volume))
+        self._apply_volume()
+
+    # Quieten the music (e.g. under a result dialog) without losing its place
+    def duck(self, level=0.2):
+        self._duck_level = level
+        self._apply_volume()
+
+    def unduck(self):
+        self._duck_level = 1.0
+        self._apply_volume()
+
+    def _apply_volume(self):
+        if self.available:
+            pygame.mixer.music.set_volume(self.music_volume * self._duck_level)
+
+
+# === Shared Sound Bank ===
+audio = AudioManager()
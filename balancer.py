@@ -0,0 +1,258 @@
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from battle_engine import LOSE, TIE, WIN, StatTable
+from rules import DIFFICULTY_MULTIPLIERS, MAX_POKEMON_ID, STAT_NAMES
+from stat_index import BUCKET_WEIGHTS, rank_weights
+
+# === Difficulty Balancer ===
+# Monte Carlo over whole rounds as the game plays them: the player is offered
+# CHOICES random Pokémon, picks one and a stat by some strategy, and battles
+# the AI's opponent, whose stats are scaled by the multiplier under test (and
+# truncated, like rules.apply_difficulty).  The AI draws from rank buckets on
+# the stat played, exactly as stat_index.pick_opponent does, using the bucket
+# weights of the level the multiplier belongs to.  Every (multiplier, strategy)
+# pair is split into CHUNK-sized tasks spread over a process pool, and running
+# totals are reported as tasks finish.
+CHOICES = 3
+# --opponent modes besides a level name
+AI = "ai"
+UNIFORM = "uniform"
+LEVEL_BY_MULTIPLIER = {multiplier: level for level, multiplier in DIFFICULTY_MULTIPLIERS.items()}
+CHUNK = 250_000
+Z_95 = 1.959964
+
+
+# === Stat-Choice Strategies ===
+# Each takes the player's stats (n x CHOICES x stats), a per-stat win
+# probability table for the current multiplier and an RNG, and returns the
+# chosen (choice, stat) index arrays.
+def random_pick(choice_stats, win_odds, choice_ids, rng):
+    n = len(choice_stats)
+    return np.zeros(n, dtype=np.intp), rng.integers(0, len(STAT_NAMES), n)
+
+
+# First Pokémon offered, its highest stat
+def highest_stat(choice_stats, win_odds, choice_ids, rng):
+    return np.zeros(len(choice_stats), dtype=np.intp), choice_stats[:, 0, :].argmax(axis=1)
+
+
+# Highest raw number across every offered Pokémon
+def highest_overall(choice_stats, win_odds, choice_ids, rng):
+    flat = choice_stats.reshape(len(choice_stats), -1).argmax(axis=1)
+    return np.divmod(flat, len(STAT_NAMES))
+
+
+# Best chance of winning: the (Pokémon, stat) that beats the most opponents
+def best_odds(choice_stats, win_odds, choice_ids, rng):
+    odds = win_odds[choice_ids]
+    flat = odds.reshape(len(odds), -1).argmax(axis=1)
+    return np.divmod(flat, len(STAT_NAMES))
+
+
+STRATEGIES = {
+    "random": random_pick,
+    "highest-stat": highest_stat,
+    "highest-overall": highest_overall,
+    "best-odds": best_odds,
+}
+
+
+# === Worker Side ===
+# The stat table is sent once per worker process, not once per task.
+_stats = None
+
+
+def _init_worker(stats):
+    global _stats
+    _stats = stats
+
+
+def opponent_stats(stats, multiplier):
+    return (stats * multiplier).astype(np.int32)
+
+
+# How likely the opponent is to come from each rank position (weakest first);
+# level None means a uniformly random opponent
+def rank_probabilities(count, level=None):
+    if level is None:
+        return np.full(count, 1 / count)
+    return np.array(rank_weights(count, level))
+
+
+# P(player value beats the opponent), per Pokémon and stat, for opponents
+# drawn from rank positions with the given probabilities
+def win_odds_table(stats, opponents, ranked, probabilities):
+    cumulative = np.concatenate(([0.0], np.cumsum(probabilities)))
+    odds = np.empty(stats.shape, dtype=np.float64)
+    for column in range(stats.shape[1]):
+        # Scaling and truncating keeps the order, so this column is sorted
+        ordered = opponents[ranked[:, column], column]
+        odds[:, column] = cumulative[np.searchsorted(ordered, stats[:, column], side="left")]
+    return odds
+
+
+def simulate_chunk(multiplier, strategy, rounds, seed, level=None, stats=None):
+    stats = _stats if stats is None else stats
+    rng = np.random.default_rng(seed)
+    opponents = opponent_stats(stats, multiplier)
+    n = len(stats)
+    # Rows ordered weakest to strongest on each raw stat, ties in dex order like StatIndex.ranked
+    ranked = np.argsort(stats, axis=0, kind="stable")
+    probabilities = rank_probabilities(n, level)
+    odds = win_odds_table(stats, opponents, ranked, probabilities) if strategy == "best-odds" else None
+
+    choice_ids = rng.integers(0, n, (rounds, CHOICES))
+    choice, stat = STRATEGIES[strategy](stats[choice_ids], odds, choice_ids, rng)
+    players = choice_ids[np.arange(rounds), choice]
+    # The AI ranks by the stat being played, so it draws once that is known
+    opponent_ids = ranked[rng.choice(n, rounds, p=probabilities), stat]
+    outcomes = np.sign(stats[players, stat] - opponents[opponent_ids, stat])
+    return (
+        multiplier,
+        strategy,
+        int(np.count_nonzero(outcomes == WIN)),
+        int(np.count_nonzero(outcomes == TIE)),
+        int(np.count_nonzero(outcomes == LOSE)),
+    )
+
+
+# === Reporting ===
+# Wilson score interval: well-behaved even for rates near 0 or 1
+def wilson_interval(successes, total, z=Z_95):
+    if total == 0:
+        return 0.0, 0.0
+    p = successes / total
+    denominator = 1 + z * z / total
+    centre = (p + z * z / (2 * total)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / total + z * z / (4 * total * total)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def summarise(multiplier, strategy, win, tie, lose):
+    total = win + tie + lose
+    result = {"multiplier": multiplier, "strategy": strategy, "rounds": total}
+    for name, count in (("win", win), ("tie", tie), ("lose", lose)):
+        low, high = wilson_interval(count, total)
+        result[name] = count / total if total else 0.0
+        result[name + "_ci"] = [low, high]
+    return result
+
+
+# === Sweep ===
+# The bucket weights a multiplier is played with: its own level's under "ai"
+# (medium's for a multiplier no level uses), a fixed level's, or none
+def opponent_level(multiplier, opponent=AI):
+    if opponent == UNIFORM:
+        return None
+    if opponent == AI:
+        return LEVEL_BY_MULTIPLIER.get(multiplier, "medium")
+    return opponent
+
+
+# Yields (finished tasks, total tasks, summary of the config just updated)
+# as results arrive, so callers can show estimates before the sweep ends.
+def sweep(stats, multipliers, strategies, rounds, workers=None, seed=None, opponent=AI):
+    if rounds <= 0:
+        raise ValueError("rounds must be positive")
+    # A repeated multiplier or strategy would run twice into the same totals
+    multipliers = list(dict.fromkeys(multipliers))
+    strategies = list(dict.fromkeys(strategies))
+    tasks = []
+    for multiplier in multipliers:
+        for strategy in strategies:
+            remaining = rounds
+            while remaining > 0:
+                tasks.append((multiplier, strategy, min(CHUNK, remaining)))
+                remaining -= CHUNK
+    seeds = np.random.SeedSequence(seed).spawn(len(tasks))
+    totals = {(m, s): [0, 0, 0] for m in multipliers for s in strategies}
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(stats,)) as pool:
+        futures = [
+            pool.submit(simulate_chunk, multiplier, strategy, size, task_seed, opponent_level(multiplier, opponent))
+            for (multiplier, strategy, size), task_seed in zip(tasks, seeds)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            multiplier, strategy, win, tie, lose = future.result()
+            counts = totals[(multiplier, strategy)]
+            counts[0] += win
+            counts[1] += tie
+            counts[2] += lose
+            yield done, len(tasks), summarise(multiplier, strategy, *counts)
+
+
+def parse_multipliers(text):
+    if ":" in text:
+        start, stop, step = (float(part) for part in text.split(":"))
+        count = int(round((stop - start) / step)) + 1
+        return [round(start + i * step, 6) for i in range(count)]
+    return [float(part) for part in text.split(",")]
+
+
+def format_row(result):
+    cells = [f"x{result['multiplier']:<5.2f} {result['strategy']:<16}"]
+    for name in ("win", "tie", "lose"):
+        low, high = result[name + "_ci"]
+        cells.append(f"{name} {result[name]:6.2%} [{low:6.2%}, {high:6.2%}]")
+    return "  ".join(cells)
+
+
+def main(argv=None):
+    default_multipliers = ",".join(str(m) for m in sorted(set(DIFFICULTY_MULTIPLIERS.values())))
+    parser = argparse.ArgumentParser(description="Sweep difficulty multipliers and stat strategies by Monte Carlo")
+    parser.add_argument("--multipliers", default=default_multipliers,
+                        help="comma list or start:stop:step (default: the current levels)")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES),
+                        help=f"comma list from {', '.join(STRATEGIES)}")
+    parser.add_argument("--rounds", type=int, default=2_000_000, help="rounds per multiplier/strategy pair")
+    parser.add_argument("--opponent", choices=[AI, UNIFORM, *BUCKET_WEIGHTS], default=AI,
+                        help="how opponents are drawn: the AI at each multiplier's own level, "
+                             "uniformly at random, or the AI at one fixed level")
+    parser.add_argument("--max-id", type=int, default=MAX_POKEMON_ID, help="sample from Pokémon 1..MAX_ID")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", metavar="PATH", help="also write the final table as JSON")
+    args = parser.parse_args(argv)
+
+    if args.rounds <= 0:
+        parser.error("--rounds must be positive")
+    multipliers = list(dict.fromkeys(parse_multipliers(args.multipliers)))
+    strategies = list(dict.fromkeys(args.strategies.split(",")))
+    unknown = [s for s in strategies if s not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+
+    table = StatTable.from_cache(range(1, args.max_id + 1))
+    print(f"{len(table)} Pokémon, {len(multipliers)} multipliers x {len(strategies)} strategies, "
+          f"{args.rounds:,} rounds each on {args.workers} processes, {args.opponent} opponents")
+
+    start = time.perf_counter()
+    latest = {}
+    for done, total, result in sweep(table.stats, multipliers, strategies, args.rounds, args.workers, args.seed,
+                                     args.opponent):
+        latest[(result["multiplier"], result["strategy"])] = result
+        if sys.stdout.isatty():
+            print(f"\r[{done}/{total}] {format_row(result)}", end="", flush=True)
+        else:
+            print(f"[{done}/{total}] {format_row(result)}")
+    elapsed = time.perf_counter() - start
+
+    results = [latest[(m, s)] for m in multipliers for s in strategies]
+    print(f"\n\nFinished in {elapsed:.1f}s")
+    for result in results:
+        print("  " + format_row(result))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
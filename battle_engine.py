@@ -0,0 +1,111 @@
+import numpy as np
+
+from pokemon_record import load_records
+from rules import DIFFICULTY_LEVELS, DIFFICULTY_MULTIPLIERS, MAX_POKEMON_ID, STAT_NAMES
+from stat_index import rank_weights
+
+# Outcome codes returned by resolve(), from the player's point of view
+WIN, TIE, LOSE = 1, 0, -1
+
+# Keep each simulation batch to a few tens of MB
+BATCH_SIZE = 1_000_000
+
+
+# === Stat Table ===
+# Every Pokémon record as one row of an (N x stats) int array, plus the difficulty
+# adjusted copies the opponent side uses, computed once per level.
+class StatTable:
+    def __init__(self, records):
+        records = list(records)
+        self.ids = np.array([r.id for r in records], dtype=np.int32)
+        self.names = [r.name for r in records]
+        self.stats = np.array([r.stat_values for r in records], dtype=np.int32).reshape(
+            len(records), len(STAT_NAMES)
+        )
+        # float64 multiply + truncation, exactly like rules.apply_difficulty
+        self.adjusted = {
+            level: (self.stats * multiplier).astype(np.int32)
+            for level, multiplier in DIFFICULTY_MULTIPLIERS.items()
+        }
+        self.rows = {int(pokemon_id): row for row, pokemon_id in enumerate(self.ids)}
+        # Rows weakest to strongest on each raw stat, ties in dex order like StatIndex.ranked
+        self.ranked = np.argsort(self.stats, axis=0, kind="stable")
+
+    @classmethod
+    def from_cache(cls, ids=range(1, MAX_POKEMON_ID + 1), cache=None):
+        return cls(load_records(ids, cache))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def stat_index(self, stat):
+        return STAT_NAMES.index(stat)
+
+    def opponent_stats(self, level):
+        return self.adjusted.get(level, self.stats)
+
+    # Chance of the opponent coming from each rank position: the AI's bucket
+    # weights for the level (stat_index.pick_opponent), or uniform
+    def rank_probabilities(self, level, ai=True):
+        if not ai:
+            return np.full(len(self), 1 / len(self))
+        return np.array(rank_weights(len(self), level))
+
+
+# === Batched Resolution ===
+# players/opponents are row indexes into the table and stats are column
+# indexes; all three broadcast against each other.
+def resolve(table, players, opponents, stats, level="medium"):
+    player_values = table.stats[players, stats]
+    opponent_values = table.opponent_stats(level)[opponents, stats]
+    return np.sign(player_values - opponent_values).astype(np.int8)
+
+
+# Exact odds for a uniformly drawn player vs the AI's opponent (or a
+# uniformly drawn one with ai=False), per stat
+def win_probabilities(table, level="medium", ai=True):
+    opponent_stats = table.opponent_stats(level)
+    cumulative = np.concatenate(([0.0], np.cumsum(table.rank_probabilities(level, ai))))
+    results = {}
+    for column, stat in enumerate(STAT_NAMES):
+        player_values = table.stats[:, column]
+        # Scaling and truncating keeps the order, so this column is sorted
+        opponent_values = opponent_stats[table.ranked[:, column], column]
+        below = cumulative[np.searchsorted(opponent_values, player_values, side="left")]
+        not_above = cumulative[np.searchsorted(opponent_values, player_values, side="right")]
+        win = below.mean()
+        tie = (not_above - below).mean()
+        results[stat] = {
+            "win": win,
+            "tie": tie,
+            "lose": 1 - win - tie,
+        }
+    return results
+
+
+# Monte Carlo over random (player, stat) draws against the AI's opponent, in bounded batches
+def simulate(table, matchups, level="medium", rng=None, ai=True):
+    rng = rng or np.random.default_rng()
+    probabilities = table.rank_probabilities(level, ai)
+    counts = {"win": 0, "tie": 0, "lose": 0}
+    remaining = matchups
+    while remaining > 0:
+        size = min(remaining, BATCH_SIZE)
+        players = rng.integers(0, len(table), size)
+        stats = rng.integers(0, len(STAT_NAMES), size)
+        opponents = table.ranked[rng.choice(len(table), size, p=probabilities), stats]
+        outcomes = resolve(table, players, opponents, stats, level)
+        counts["win"] += int(np.count_nonzero(outcomes == WIN))
+        counts["tie"] += int(np.count_nonzero(outcomes == TIE))
+        counts["lose"] += int(np.count_nonzero(outcomes == LOSE))
+        remaining -= size
+    return counts
+
+
+if __name__ == "__main__":
+    table = StatTable.from_cache()
+    print(f"Loaded {len(table)} Pokémon")
+    for level in DIFFICULTY_LEVELS:
+        print(f"\n{level.capitalize()}")
+        for stat, odds in win_probabilities(table, level).items():
+            print(f"  {stat:<16} win {odds['win']:6.1%}  tie {odds['tie']:6.1%}  lose {odds['lose']:6.1%}")
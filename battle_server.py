@@ -0,0 +1,208 @@
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import signal
+from collections import Counter
+
+from high_scores import get_store
+from pokemon_record import load_records
+from rules import DIFFICULTY_LEVELS, MAX_POKEMON_ID, STAT_NAMES, WIN, battle_outcome
+from stat_index import StatIndex
+
+# === Battle Server ===
+# Headless Top Trumps over plain TCP, one JSON object per line each way.
+# Every request may carry an "rid" that is echoed back, so clients can
+# pipeline requests and still match up replies.
+#
+#   {"op": "new_match", "player": "ash", "difficulty": "hard"}
+#       -> {"op": "choices", "match": 7, "choices": [{"id", "name", "stats"}, ...]}
+#   {"op": "play", "match": 7, "choice": 1, "stat": "speed"}
+#       -> {"op": "result", "match": 7, "outcome": "win", "player_value": 90,
+#           "opponent": {"id", "name", "value"}}
+#   {"op": "leaderboard", "limit": 5}
+#       -> {"op": "leaderboard", "scores": [["ash", 12], ...]}
+#
+# Rounds follow the front ends: the player picks one of CHOICES Pokémon and a
+# stat, the AI draws the opponent from the stat index, and the opponent's stat
+# is difficulty-adjusted before battle_outcome decides.  Pokémon data is
+# loaded once at startup; wins are buffered and written in batches.
+HOST = "127.0.0.1"
+PORT = 8765
+CHOICES = 3
+FLUSH_SECONDS = 1.0
+MAX_LINE_BYTES = 64 * 1024
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class Match:
+    __slots__ = ("player", "level", "choices")
+
+    def __init__(self, player, level, choices):
+        self.player = player
+        self.level = level
+        self.choices = choices
+
+
+class BattleServer:
+    def __init__(self, records, store=None, rng=None, flush_seconds=FLUSH_SECONDS):
+        self.records = {r.id: r for r in records}
+        self.ids = sorted(self.records)
+        self.index = StatIndex(self.records.values())
+        # Cards are sent as-is in every "choices" reply, so build them once
+        self.cards = {
+            r.id: {"id": r.id, "name": r.name, "stats": dict(zip(STAT_NAMES, r.stat_values))}
+            for r in self.records.values()
+        }
+        self.store = store or get_store()
+        self.rng = rng or random.Random()
+        self.flush_seconds = flush_seconds
+        self.matches = {}
+        self.pending_wins = Counter()
+        self.rounds_played = 0
+        self._match_ids = itertools.count(1)
+        self._server = None
+        self._flusher = None
+
+    # === Game Logic ===
+    def new_match(self, player, level="medium"):
+        if level not in DIFFICULTY_LEVELS:
+            raise ProtocolError(f"unknown difficulty {level!r}")
+        match_id = next(self._match_ids)
+        choices = [self.rng.choice(self.ids) for _ in range(CHOICES)]
+        self.matches[match_id] = Match(str(player), level, choices)
+        return {"op": "choices", "match": match_id, "choices": [self.cards[i] for i in choices]}
+
+    def play(self, match_id, choice, stat):
+        match = self.matches.pop(match_id, None)
+        if match is None:
+            raise ProtocolError(f"no open match {match_id!r}")
+        if stat not in STAT_NAMES or not 0 <= choice < len(match.choices):
+            self.matches[match_id] = match
+            raise ProtocolError("choice or stat out of range")
+
+        column = STAT_NAMES.index(stat)
+        player_value = self.records[match.choices[choice]].stat_values[column]
+        opponent = self.records[self.index.pick_opponent(match.level, stat, self.rng)]
+        opponent_value = opponent.adjusted_values(match.level)[column]
+        outcome = battle_outcome(player_value, opponent_value)
+        if outcome == WIN:
+            self.pending_wins[match.player] += 1
+        self.rounds_played += 1
+        return {
+            "op": "result",
+            "match": match_id,
+            "outcome": outcome,
+            "player_value": player_value,
+            "opponent": {"id": opponent.id, "name": opponent.name, "value": opponent_value},
+        }
+
+    async def leaderboard(self, limit=5):
+        scores = await asyncio.get_running_loop().run_in_executor(None, self.store.top, int(limit))
+        return {"op": "leaderboard", "scores": [list(row) for row in scores]}
+
+    async def handle(self, message):
+        op = message.get("op")
+        if op == "new_match":
+            return self.new_match(message.get("player", "anonymous"), message.get("difficulty", "medium"))
+        if op == "play":
+            return self.play(message.get("match"), int(message.get("choice", -1)), message.get("stat"))
+        if op == "leaderboard":
+            return await self.leaderboard(message.get("limit", 5))
+        raise ProtocolError(f"unknown op {op!r}")
+
+    # === Connections ===
+    async def serve_client(self, reader, writer):
+        # Matches opened on this connection and not played yet; dropped on disconnect
+        open_matches = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                message = None
+                try:
+                    message = json.loads(line)
+                    reply = await self.handle(message)
+                except (ProtocolError, ValueError, TypeError, AttributeError) as e:
+                    message = message if isinstance(message, dict) else {}
+                    reply = {"op": "error", "error": str(e)}
+                if reply["op"] == "choices":
+                    open_matches.add(reply["match"])
+                elif reply["op"] == "result":
+                    open_matches.discard(reply["match"])
+                if "rid" in message:
+                    reply["rid"] = message["rid"]
+                writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for match_id in open_matches:
+                self.matches.pop(match_id, None)
+            writer.close()
+
+    # === Batched Leaderboard Writes ===
+    # One transaction per interval however many matches finished in it; the
+    # write itself runs on a thread so the event loop never waits on SQLite.
+    async def flush_wins(self):
+        if not self.pending_wins:
+            return
+        batch, self.pending_wins = self.pending_wins, Counter()
+        await asyncio.get_running_loop().run_in_executor(None, self.store.add_many, list(batch.items()))
+
+    async def _flush_forever(self):
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            await self.flush_wins()
+
+    async def start(self, host=HOST, port=PORT):
+        self._server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE_BYTES)
+        self._flusher = asyncio.create_task(self._flush_forever())
+        return self._server
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+        if self._server is not None:
+            self._server.close()
+        await self.flush_wins()
+
+
+async def serve(host, port, max_id):
+    server = BattleServer(load_records(range(1, max_id + 1)))
+    listener = await server.start(host, port)
+    # A plain kill also goes through the final flush of buffered wins
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+    print(f"Serving {len(server.records)} Pokémon on {host}:{port}", flush=True)
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Top Trumps battle server (JSON lines over TCP)")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--max-id", type=int, default=MAX_POKEMON_ID, help="play with Pokémon 1..MAX_ID")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.max_id))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass
+
+
+if __name__ == "__main__":
+    main()
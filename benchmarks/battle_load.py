@@ -0,0 +1,99 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.run_benchmarks import summarize  # noqa: E402
+from rules import DIFFICULTY_LEVELS, STAT_NAMES  # noqa: E402
+
+# === Battle Server Load Generator ===
+# Opens --clients connections; each plays matches back to back (new_match then
+# play, picking the best stat of a random choice) until --duration runs out.
+# Reports completed matches per second and the latency of every "play" move.
+
+
+async def client(host, port, deadline, rng, latencies, counts):
+    reader, writer = await asyncio.open_connection(host, port)
+    player = f"bot{rng.randrange(10**6)}"
+
+    async def request(message):
+        writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    try:
+        while time.perf_counter() < deadline:
+            offer = await request({"op": "new_match", "player": player, "difficulty": rng.choice(DIFFICULTY_LEVELS)})
+            choice = rng.randrange(len(offer["choices"]))
+            stats = offer["choices"][choice]["stats"]
+            stat = max(STAT_NAMES, key=stats.__getitem__)
+
+            start = time.perf_counter()
+            result = await request({"op": "play", "match": offer["match"], "choice": choice, "stat": stat})
+            latencies.append((time.perf_counter() - start) * 1000)
+            counts[result.get("outcome", "error")] = counts.get(result.get("outcome", "error"), 0) + 1
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, duration, seed=None):
+    rng = random.Random(seed)
+    latencies = []
+    counts = {}
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        client(host, port, deadline, random.Random(rng.random()), latencies, counts) for _ in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    matches = len(latencies)
+    return {
+        "clients": clients,
+        "seconds": round(elapsed, 3),
+        "matches": matches,
+        "matches_per_second": round(matches / elapsed, 1),
+        "outcomes": counts,
+        "play_latency": summarize(latencies),
+    }
+
+
+# Start battle_server.py in its own process and wait until it accepts connections
+def spawn_server(port, max_id=None):
+    command = [sys.executable, os.path.join(REPO_ROOT, "battle_server.py"), "--port", str(port)]
+    if max_id:
+        command += ["--max-id", str(max_id)]
+    server = subprocess.Popen(command, cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    server.stdout.readline()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the battle server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=200, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--spawn", action="store_true", help="start a local battle_server.py first")
+    parser.add_argument("--max-id", type=int, help="passed to the spawned server")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    server = spawn_server(args.port, args.max_id) if args.spawn else None
+    try:
+        results = asyncio.run(run_load(args.host, args.port, args.clients, args.duration, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import json
+import random
+import re
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# === Fake PokeAPI ===
+# A local stand-in for pokeapi.co and the sprite host, serving the same URL
+# shapes with synthetic but realistically sized payloads.  `latency` (seconds)
+# is added to every response to mimic a slow network, and fail() queues error
+# statuses to answer the next requests with, to exercise the client's retries.
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+POKEMON_PATH = re.compile(r"^/api/v2/pokemon/(\d+)/?$")
+SPRITE_PATH = re.compile(r"^/PokeAPI/sprites/master/sprites/pokemon/(\d+)\.png$")
+
+
+def fake_pokemon(pokemon_id, moves=400):
+    rng = random.Random(pokemon_id)
+    return {
+        "id": pokemon_id,
+        "name": f"pokemon-{pokemon_id}",
+        "height": rng.randint(1, 40),
+        "weight": rng.randint(10, 2000),
+        "stats": [
+            {"base_stat": rng.randint(10, 160), "effort": 0, "stat": {"name": name, "url": ""}}
+            for name in STAT_NAMES
+        ],
+        # The real payload is mostly moves, game indices and sprite variants
+        "moves": [
+            {"move": {"name": f"move-{i}", "url": f"https://pokeapi.co/api/v2/move/{i}/"},
+             "version_group_details": [{"level_learned_at": i % 50, "version_group": {"name": "red-blue"}}]}
+            for i in range(moves)
+        ],
+        "game_indices": [{"game_index": pokemon_id, "version": {"name": f"v{i}"}} for i in range(20)],
+        "sprites": {"front_default": f"/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png"},
+    }
+
+
+def _png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+
+def fake_sprite(pokemon_id, size=96):
+    rng = random.Random(pokemon_id)
+    r, g, b = rng.randrange(256), rng.randrange(256), rng.randrange(256)
+    row = b"\x00" + bytes((r, g, b, 255)) * size
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 6, 0, 0, 0))
+        + _png_chunk(b"IDAT", zlib.compress(row * size))
+        + _png_chunk(b"IEND", b"")
+    )
+
+
+class FakePokeAPIHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if server.latency:
+            time.sleep(server.latency)
+        server.request_count += 1
+        with server.lock:
+            status = server.failures.popleft() if server.failures else None
+        if status is not None:
+            return self._send(status, "text/plain", b"Injected failure")
+
+        match = POKEMON_PATH.match(self.path)
+        if match:
+            body = json.dumps(fake_pokemon(int(match.group(1)), server.moves)).encode()
+            return self._send(200, "application/json", body)
+        match = SPRITE_PATH.match(self.path)
+        if match:
+            return self._send(200, "image/png", fake_sprite(int(match.group(1))))
+        self._send(404, "text/plain", b"Not Found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakePokeAPI:
+    def __init__(self, latency=0.0, moves=400, host="127.0.0.1", port=0):
+        self.server = ThreadingHTTPServer((host, port), FakePokeAPIHandler)
+        self.server.daemon_threads = True
+        self.server.latency = latency
+        self.server.moves = moves
+        self.server.request_count = 0
+        self.server.failures = deque()
+        self.server.lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def request_count(self):
+        return self.server.request_count
+
+    def set_latency(self, latency):
+        self.server.latency = latency
+
+    # Answer the next len(statuses) requests with these statuses, in order
+    def fail(self, *statuses):
+        with self.server.lock:
+            self.server.failures.extend(statuses)
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a fake PokeAPI + sprite host locally")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    args = parser.parse_args()
+    api = FakePokeAPI(latency=args.latency, port=args.port)
+    print(f"Fake PokeAPI on {api.url} (set POKEAPI_BASE_URL and SPRITE_BASE_URL to this)")
+    api.server.serve_forever()
@@ -0,0 +1,214 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Render benchmarks run without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+from benchmarks.fake_pokeapi import FakePokeAPI  # noqa: E402
+
+
+# === Timing Helpers ===
+def percentile(sorted_samples, q):
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, int(round(q * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarize(samples_ms):
+    ordered = sorted(samples_ms)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 4),
+        "p99_ms": round(percentile(ordered, 0.99), 4),
+        "min_ms": round(ordered[0], 4) if ordered else 0.0,
+        "max_ms": round(ordered[-1], 4) if ordered else 0.0,
+    }
+
+
+def time_each(fn, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def time_repeat(fn, repeats):
+    return time_each(fn, [()] * repeats)
+
+
+# === Network: data and sprite fetches against the fake API ===
+def bench_network(api, latencies, count):
+    import pokemon_cache
+    import sprite_cache
+    import pokemon_showdown
+    import pokemon_showdown1
+    import main as tk_main
+
+    data_cache = pokemon_cache.get_cache()
+    sprites = sprite_cache.get_cache()
+    ids = [(i,) for i in range(1, count + 1)]
+    results = {}
+    for latency in latencies:
+        api.set_latency(latency)
+        key = f"latency_{int(latency * 1000)}ms"
+        data_cache.clear()
+        results[key] = {"get_pokemon_data_cold": time_each(pokemon_showdown.get_pokemon_data, ids)}
+        results[key]["get_pokemon_data_warm"] = time_each(pokemon_showdown.get_pokemon_data, ids)
+        data_cache.clear()
+        results[key]["fetch_pokemon_cold"] = time_each(pokemon_showdown1.fetch_pokemon, ids)
+        results[key]["fetch_pokemon_warm"] = time_each(pokemon_showdown1.fetch_pokemon, ids)
+
+        urls = [(pokemon_cache.sprite_url(i),) for i in range(1, count + 1)]
+        for name, loader in (("load_pokemon_image", tk_main.load_pokemon_image),
+                             ("load_image", pokemon_showdown1.load_image)):
+            sprites.clear_memory()
+            sprites.clear_disk()
+            results[key][f"{name}_cold"] = time_each(loader, urls)
+            sprites.clear_memory()
+            results[key][f"{name}_disk"] = time_each(loader, urls)
+            results[key][f"{name}_memory"] = time_each(loader, urls)
+    results["requests_served"] = api.request_count
+    return results
+
+
+# === Rendering under SDL's dummy driver ===
+def bench_render(frames):
+    import pygame
+    import pokemon_showdown
+    import pokemon_showdown1
+
+    # The games load their images relative to the working directory, like
+    # startup_time.py's subprocesses run from the repo root
+    cwd = os.getcwd()
+    os.chdir(REPO_ROOT)
+    try:
+        pokemon_showdown.init_game()
+        pokemon_showdown1.init_game()
+    finally:
+        os.chdir(cwd)
+    screen = pokemon_showdown.screen
+    pokemons = [pokemon_showdown.get_pokemon_data(i) for i in (1, 4, 7)]
+
+    def showdown_frame():
+        for i, pkmn in enumerate(pokemons):
+            pokemon_showdown.display_pokemon(pkmn, 50 + i * 250, 100)
+        pokemon_showdown.draw_text("Click to choose your Pokémon", 240, 500)
+        pokemon_showdown.renderer.present()
+
+    results = {}
+    pokemon_showdown.renderer.invalidate()
+    results["showdown_select_first_frame"] = time_repeat(showdown_frame, 1)
+    results["showdown_select_static_frame"] = time_repeat(showdown_frame, frames)
+
+    def uncached_frame():
+        pokemon_showdown.renderer.invalidate()
+        showdown_frame()
+
+    results["showdown_select_full_redraw"] = time_repeat(uncached_frame, frames)
+
+    for name, scene in (("main_menu", pokemon_showdown1.MainMenuScene()),
+                        ("settings_menu", pokemon_showdown1.SettingsScene()),
+                        ("high_scores", pokemon_showdown1.HighScoresScene())):
+        scene.enter()
+
+        def menu_frame():
+            pygame.event.pump()
+            scene.draw(screen)
+            pygame.display.update()
+
+        results[f"{name}_frame"] = time_repeat(menu_frame, frames)
+    return results
+
+
+# === High score writes at different table sizes ===
+def bench_high_scores(sizes, writes, workdir):
+    from high_scores import HighScoreStore
+
+    results = {}
+    for size in sizes:
+        store = HighScoreStore(os.path.join(workdir, f"scores_{size}.db"), legacy_json_path=None)
+        store.add_many((f"player-{i}", i % 500) for i in range(size))
+        args = [(f"player-{(i * 7919) % size}", 1) for i in range(writes)]
+        start = time.perf_counter()
+        update = time_each(store.add_wins, args)
+        elapsed = time.perf_counter() - start
+        results[f"players_{size}"] = {
+            "update_high_scores": update,
+            "updates_per_second": round(writes / elapsed, 1),
+            "top_5": time_repeat(lambda: store.top(5), 100),
+        }
+        store.close()
+    return results
+
+
+def git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pokémon Showdown benchmarks (JSON output)")
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    parser.add_argument("--only", choices=["network", "render", "high_scores"], action="append")
+    parser.add_argument("--count", type=int, default=20, help="Pokémon per network run")
+    parser.add_argument("--latency", type=float, action="append", help="fake API latency in seconds")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--writes", type=int, default=1_000)
+    args = parser.parse_args(argv)
+    suites = args.only or ["network", "render", "high_scores"]
+
+    workdir = tempfile.mkdtemp(prefix="showdown-bench-")
+    api = FakePokeAPI().start()
+    # Point every cache and store at scratch space and every fetch at the fake API
+    # before any game module is imported, since they read these at import time.
+    os.environ["POKEAPI_BASE_URL"] = api.url
+    os.environ["SPRITE_BASE_URL"] = api.url
+    os.environ["POKEMON_CACHE_PATH"] = os.path.join(workdir, "pokemon_cache.db")
+    os.environ["SPRITE_CACHE_DIR"] = os.path.join(workdir, "sprites")
+    os.environ["HIGH_SCORES_DB"] = os.path.join(workdir, "high_scores.db")
+
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": {},
+    }
+    try:
+        if "network" in suites:
+            report["results"]["network"] = bench_network(api, args.latency or [0.0, 0.05], args.count)
+        if "render" in suites:
+            report["results"]["render"] = bench_render(args.frames)
+        if "high_scores" in suites:
+            report["results"]["high_scores"] = bench_high_scores(args.sizes, args.writes, workdir)
+    finally:
+        api.stop()
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+
+# === Startup Budget ===
+# Import time (ms) allowed per module, measured in a fresh interpreter with no
+# display.  The entry points pay for importing pygame and requests, nothing
+# else; the pure logic modules should load in a few milliseconds.
+STARTUP_BUDGET_MS = {
+    "rules": 5,
+    "scheduler": 10,
+    "high_scores": 20,
+    "pokemon_showdown": 300,
+    "pokemon_showdown1": 300,
+    "main": 400,
+}
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(json.dumps((time.perf_counter() - start) * 1000))
+"""
+
+
+def headless_env():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def import_time_ms(module, repeats=3):
+    # Best of a few runs, each in a new process so nothing is already imported
+    times = []
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", MEASURE, module],
+            cwd=REPO_ROOT, env=headless_env(), capture_output=True, text=True, check=True,
+        )
+        times.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return min(times)
+
+
+def main():
+    results = []
+    for module, budget in STARTUP_BUDGET_MS.items():
+        ms = import_time_ms(module)
+        results.append({"module": module, "import_ms": round(ms, 2), "budget_ms": budget, "ok": ms <= budget})
+    print(json.dumps(results, indent=2))
+    return 0 if all(r["ok"] for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
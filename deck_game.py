@@ -0,0 +1,227 @@
+import argparse
+import random
+import statistics
+import time
+from collections import deque, namedtuple
+
+from pokemon_record import load_records
+from rules import DIFFICULTY_LEVELS, LOSE, MAX_POKEMON_ID, STAT_NAMES, WIN, battle_outcome
+
+# === Full-Deck Top Trumps ===
+# The dex is shuffled and dealt into two decks.  Each round both sides turn
+# over their top card and whoever holds the turn picks a stat; the higher
+# value takes both cards (and the pot) to the bottom of their deck, while a
+# tie leaves both cards in the pot for the next round.  The game ends when
+# one side holds every card.  The computer's cards are compared with their
+# difficulty-adjusted stats, exactly like the one-off battles.
+#
+# Cards are row indexes into per-side stat arrays, and the decks are deques,
+# so a round is a couple of popleft/extend calls.
+PLAYER = "player"
+OPPONENT = "opponent"
+DRAW = "draw"
+# Deterministic strategies can loop forever; call it a draw after this many rounds
+MAX_ROUNDS = 5000
+
+Round = namedtuple("Round", "player_card opponent_card stat outcome pot")
+
+
+# === Stat Strategies ===
+# A strategy gets the chooser's card stats (in STAT_NAMES order) and an RNG,
+# and returns the index of the stat to play.  Strategies marked `static` only
+# look at the card, so their pick is worked out once per card up front.
+def best_stat(values, rng):
+    return max(range(len(values)), key=values.__getitem__)
+
+
+def random_stat(values, rng):
+    return rng.randrange(len(values))
+
+
+def first_stat(values, rng):
+    return 0
+
+
+best_stat.static = True
+first_stat.static = True
+
+
+STRATEGIES = {"best": best_stat, "random": random_stat, "first": first_stat}
+
+
+class DeckGame:
+    def __init__(self, cards, level="medium", rng=None,
+                 player_strategy=best_stat, opponent_strategy=best_stat, max_rounds=MAX_ROUNDS):
+        self.cards = list(cards)
+        self.level = level
+        self.rng = rng or random.Random()
+        self.player_strategy = player_strategy
+        self.opponent_strategy = opponent_strategy
+        self.max_rounds = max_rounds
+        self.player_values = [card.stat_values for card in self.cards]
+        self.opponent_values = [card.adjusted_values(level) for card in self.cards]
+        self.player_picks = self._precompute(player_strategy, self.player_values)
+        self.opponent_picks = self._precompute(opponent_strategy, self.opponent_values)
+        self.deal()
+
+    def _precompute(self, strategy, values):
+        if not getattr(strategy, "static", False):
+            return None
+        return [strategy(card_values, self.rng) for card_values in values]
+
+    def deal(self):
+        order = list(range(len(self.cards)))
+        self.rng.shuffle(order)
+        self.player = deque(order[0::2])
+        self.opponent = deque(order[1::2])
+        self.pot = []
+        self.turn = PLAYER
+        self.rounds = 0
+        self.ties = 0
+
+    @property
+    def finished(self):
+        return not self.player or not self.opponent or self.rounds >= self.max_rounds
+
+    @property
+    def winner(self):
+        if not self.finished:
+            return None
+        if self.player and not self.opponent:
+            return PLAYER
+        if self.opponent and not self.player:
+            return OPPONENT
+        return DRAW
+
+    def top_cards(self):
+        return self.cards[self.player[0]], self.cards[self.opponent[0]]
+
+    # Play one round.  `stat` (a STAT_NAMES entry) is only needed when a human
+    # holds the turn; otherwise the side's strategy picks.
+    def play_round(self, stat=None):
+        player_card = self.player.popleft()
+        opponent_card = self.opponent.popleft()
+        player_values = self.player_values[player_card]
+        opponent_values = self.opponent_values[opponent_card]
+
+        if stat is not None:
+            column = STAT_NAMES.index(stat)
+        elif self.turn == PLAYER:
+            column = self.player_strategy(player_values, self.rng)
+        else:
+            column = self.opponent_strategy(opponent_values, self.rng)
+
+        outcome = battle_outcome(player_values[column], opponent_values[column])
+        if outcome == WIN:
+            self.player.append(player_card)
+            self.player.append(opponent_card)
+            self.player.extend(self.pot)
+            self.pot.clear()
+            self.turn = PLAYER
+        elif outcome == LOSE:
+            self.opponent.append(opponent_card)
+            self.opponent.append(player_card)
+            self.opponent.extend(self.pot)
+            self.pot.clear()
+            self.turn = OPPONENT
+        else:
+            self.pot.append(player_card)
+            self.pot.append(opponent_card)
+            self.ties += 1
+        self.rounds += 1
+        return Round(self.cards[player_card], self.cards[opponent_card], STAT_NAMES[column], outcome, len(self.pot))
+
+    # Same rules as play_round, inlined with locals: this is the headless hot loop
+    def play_out(self):
+        player, opponent, pot = self.player, self.opponent, self.pot
+        player_values, opponent_values = self.player_values, self.opponent_values
+        player_picks, opponent_picks = self.player_picks, self.opponent_picks
+        player_strategy, opponent_strategy, rng = self.player_strategy, self.opponent_strategy, self.rng
+        player_turn = self.turn == PLAYER
+        rounds, ties, max_rounds = self.rounds, self.ties, self.max_rounds
+
+        while player and opponent and rounds < max_rounds:
+            p = player.popleft()
+            o = opponent.popleft()
+            if player_turn:
+                column = player_picks[p] if player_picks is not None else player_strategy(player_values[p], rng)
+            else:
+                column = opponent_picks[o] if opponent_picks is not None else opponent_strategy(opponent_values[o], rng)
+            a = player_values[p][column]
+            b = opponent_values[o][column]
+            if a > b:
+                player.append(p)
+                player.append(o)
+                if pot:
+                    player.extend(pot)
+                    pot.clear()
+                player_turn = True
+            elif a < b:
+                opponent.append(o)
+                opponent.append(p)
+                if pot:
+                    opponent.extend(pot)
+                    pot.clear()
+                player_turn = False
+            else:
+                pot.append(p)
+                pot.append(o)
+                ties += 1
+            rounds += 1
+
+        self.turn = PLAYER if player_turn else OPPONENT
+        self.rounds, self.ties = rounds, ties
+        return self.winner
+
+
+# === Headless Statistics ===
+def run_games(cards, games, level="medium", player_strategy=best_stat, opponent_strategy=best_stat, seed=None):
+    rng = random.Random(seed)
+    game = DeckGame(cards, level, rng, player_strategy, opponent_strategy)
+    winners = {PLAYER: 0, OPPONENT: 0, DRAW: 0}
+    lengths = []
+    ties = 0
+    for _ in range(games):
+        game.deal()
+        winners[game.play_out()] += 1
+        lengths.append(game.rounds)
+        ties += game.ties
+    lengths.sort()
+    return {
+        "games": games,
+        "player_win_rate": winners[PLAYER] / games,
+        "opponent_win_rate": winners[OPPONENT] / games,
+        "draw_rate": winners[DRAW] / games,
+        "rounds_mean": statistics.fmean(lengths),
+        "rounds_median": statistics.median(lengths),
+        "rounds_p90": lengths[int(0.9 * (len(lengths) - 1))],
+        "ties_per_game": ties / games,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play full-deck Top Trumps games headless and report statistics")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--level", choices=DIFFICULTY_LEVELS, default="medium")
+    parser.add_argument("--player-strategy", choices=sorted(STRATEGIES), default="best")
+    parser.add_argument("--opponent-strategy", choices=sorted(STRATEGIES), default="best")
+    parser.add_argument("--max-id", type=int, default=MAX_POKEMON_ID, help="deck is Pokémon 1..MAX_ID")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    cards = load_records(range(1, args.max_id + 1))
+    start = time.perf_counter()
+    results = run_games(cards, args.games, args.level,
+                        STRATEGIES[args.player_strategy], STRATEGIES[args.opponent_strategy], args.seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"{args.games} games with a {len(cards)}-card deck ({args.level}) "
+          f"in {elapsed:.2f}s ({args.games / elapsed:,.0f} games/s)")
+    print(f"  player wins {results['player_win_rate']:6.1%}  opponent wins {results['opponent_win_rate']:6.1%}"
+          f"  draws {results['draw_rate']:6.1%}")
+    print(f"  rounds: mean {results['rounds_mean']:.1f}  median {results['rounds_median']:.0f}"
+          f"  p90 {results['rounds_p90']}  ties/game {results['ties_per_game']:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import csv
+import glob
+import json
+import os
+
+from rules import STAT_NAMES
+
+# === Dataset Format ===
+# One compact JSON file: the stat order once, then one row per Pokémon as
+# [id, name, height, weight, [base stats in STAT_NAMES order]].
+DATASET_PATH = os.environ.get("POKEDEX_DATASET", "pokedex.json")
+DATASET_VERSION = 1
+
+
+def record_to_row(record):
+    return [
+        record["id"],
+        record["name"],
+        record["height"],
+        record.get("weight"),
+        [record["stats"].get(name, 0) for name in STAT_NAMES],
+    ]
+
+
+def row_to_record(row):
+    pokemon_id, name, height, weight, stats = row
+    return {
+        "name": name,
+        "id": pokemon_id,
+        "height": height,
+        "weight": weight,
+        "stats": dict(zip(STAT_NAMES, stats)),
+    }
+
+
+def save_dataset(records, path=DATASET_PATH):
+    rows = sorted((record_to_row(r) for r in records), key=lambda row: row[0])
+    data = {"version": DATASET_VERSION, "stat_names": list(STAT_NAMES), "pokemon": rows}
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def load_dataset(path=DATASET_PATH):
+    with open(path, "r") as f:
+        data = json.load(f)
+    if data.get("version") != DATASET_VERSION or tuple(data.get("stat_names", ())) != STAT_NAMES:
+        raise ValueError(f"{path} is not a version {DATASET_VERSION} Pokédex dataset")
+    return [row_to_record(row) for row in data["pokemon"]]
+
+
+# === Sources ===
+# Full /pokemon/{id} JSON as served by PokeAPI (or the PokeAPI/api-data repo)
+def record_from_api_json(data):
+    return {
+        "name": data["name"],
+        "id": data["id"],
+        "height": data["height"],
+        "weight": data.get("weight"),
+        "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
+    }
+
+
+# A checkout of PokeAPI/api-data: .../api/v2/pokemon/<id>/index.json
+def read_api_data(directory):
+    pattern = os.path.join(directory, "**", "api", "v2", "pokemon", "*", "index.json")
+    for path in glob.iglob(pattern, recursive=True):
+        with open(path, "r", encoding="utf-8") as f:
+            yield record_from_api_json(json.load(f))
+
+
+# PokeAPI's CSV dump (data/v2/csv in the pokeapi repo)
+def read_csv_dump(directory):
+    def rows(name):
+        with open(os.path.join(directory, name), newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    stat_names = {row["id"]: row["identifier"] for row in rows("stats.csv")}
+    stats = {}
+    for row in rows("pokemon_stats.csv"):
+        name = stat_names.get(row["stat_id"])
+        if name in STAT_NAMES:
+            stats.setdefault(row["pokemon_id"], {})[name] = int(row["base_stat"])
+    for row in rows("pokemon.csv"):
+        yield {
+            "name": row["identifier"],
+            "id": int(row["id"]),
+            "height": int(row["height"]),
+            "weight": int(row["weight"]),
+            "stats": stats.get(row["id"], {}),
+        }
+
+
+# Walk the live API (or any mirror of it) once
+def crawl(base_url, limit=None):
+    import http_client
+    from pokeapi_projection import POKEMON_FIELDS, project_response
+
+    listing = http_client.get(f"{base_url}/api/v2/pokemon?limit=100000").json()
+    urls = [entry["url"] for entry in listing["results"]][:limit]
+    for i, url in enumerate(urls, 1):
+        response = http_client.get(url, stream=True)
+        if response.status_code == 200:
+            yield record_from_api_json(project_response(response, POKEMON_FIELDS))
+        else:
+            response.close()
+        if i % 50 == 0:
+            print(f"  crawled {i}/{len(urls)}")
+
+
+# Copy the dataset into the game's Pokémon cache so it can run with POKEMON_OFFLINE=1
+def seed_cache(records):
+    from pokemon_cache import get_cache
+
+    cache = get_cache()
+    for record in records:
+        cache.put(record["id"], record)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the local Pokédex dataset")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--api-data", metavar="DIR", help="PokeAPI/api-data checkout")
+    source.add_argument("--csv", metavar="DIR", help="PokeAPI CSV dump directory")
+    source.add_argument("--crawl", metavar="BASE_URL", nargs="?", const="https://pokeapi.co",
+                        help="crawl a PokeAPI server once (default https://pokeapi.co)")
+    parser.add_argument("--limit", type=int, help="only crawl the first N Pokémon")
+    parser.add_argument("--output", default=DATASET_PATH)
+    parser.add_argument("--seed-cache", action="store_true", help="also load into pokemon_cache.db")
+    args = parser.parse_args(argv)
+
+    if args.api_data:
+        records = list(read_api_data(args.api_data))
+    elif args.csv:
+        records = list(read_csv_dump(args.csv))
+    else:
+        records = list(crawl(args.crawl.rstrip("/"), args.limit))
+
+    count = save_dataset(records, args.output)
+    print(f"Wrote {count} Pokémon to {args.output}")
+    if args.seed_cache:
+        seed_cache(records)
+        print("Seeded the local Pokémon cache")
+
+
+if __name__ == "__main__":
+    main()
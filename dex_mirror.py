@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from dex_ingest import DATASET_PATH, load_dataset
+
+# === Local PokeAPI Mirror ===
+# Serves the same URL shapes the game fetches from pokeapi.co and the sprite
+# host, straight from the local dataset.  Point the game at it with
+#   POKEAPI_BASE_URL=http://127.0.0.1:8000 SPRITE_BASE_URL=http://127.0.0.1:8000
+POKEMON_PATH = re.compile(r"^/api/v2/pokemon/([^/]+)/?$")
+LIST_PATH = re.compile(r"^/api/v2/pokemon/?$")
+# Not a PokeAPI route: /api/v2/pokemon-batch?ids=1,4,7 returns the game's trimmed
+# records for many Pokémon in one response (see pokemon_cache.fetch_batch_mirror)
+BATCH_PATH = re.compile(r"^/api/v2/pokemon-batch/?$")
+SPRITE_PATH = re.compile(r"^/PokeAPI/sprites/master/sprites/pokemon/(\d+)\.png$")
+
+
+def api_json(record, base_url):
+    return {
+        "id": record["id"],
+        "name": record["name"],
+        "height": record["height"],
+        "weight": record["weight"],
+        "stats": [
+            {"base_stat": value, "effort": 0, "stat": {"name": name, "url": ""}}
+            for name, value in record["stats"].items()
+        ],
+        "sprites": {
+            "front_default": f"{base_url}/PokeAPI/sprites/master/sprites/pokemon/{record['id']}.png",
+        },
+    }
+
+
+class DexMirror:
+    def __init__(self, records, sprites_dir=None, host="127.0.0.1", port=8000):
+        self.sprites_dir = sprites_dir
+        self.server = ThreadingHTTPServer((host, port), MirrorHandler)
+        self.server.daemon_threads = True
+        self.server.mirror = self
+        self._thread = None
+        self.load(records)
+
+    def load(self, records):
+        self.by_id = {r["id"]: r for r in records}
+        self.by_name = {r["name"]: r for r in records}
+        self.ids = sorted(self.by_id)
+        # Responses are pre-serialised once; the dataset never changes while serving
+        self._bodies = {
+            pokemon_id: json.dumps(api_json(r, self.url), separators=(",", ":")).encode()
+            for pokemon_id, r in self.by_id.items()
+        }
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def pokemon_body(self, key):
+        record = self.by_id.get(int(key)) if key.isdigit() else self.by_name.get(key.lower())
+        return self._bodies.get(record["id"]) if record else None
+
+    def list_body(self, limit, offset):
+        page = self.ids[offset:offset + limit]
+        return json.dumps({
+            "count": len(self.ids),
+            "results": [
+                {"name": self.by_id[i]["name"], "url": f"{self.url}/api/v2/pokemon/{i}/"} for i in page
+            ],
+        }).encode()
+
+    def batch_body(self, ids):
+        records = [self.by_id[i] for i in dict.fromkeys(ids) if i in self.by_id]
+        return json.dumps({"pokemon": records}, separators=(",", ":")).encode()
+
+    def sprite_path(self, pokemon_id):
+        if not self.sprites_dir:
+            return None
+        path = os.path.join(self.sprites_dir, f"{pokemon_id}.png")
+        return path if os.path.exists(path) else None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class MirrorHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        mirror = self.server.mirror
+        parts = urlsplit(self.path)
+
+        match = POKEMON_PATH.match(parts.path)
+        if match:
+            body = mirror.pokemon_body(match.group(1))
+            if body is not None:
+                return self._send(200, "application/json", body)
+            return self._send(404, "text/plain", b"Not Found")
+
+        if LIST_PATH.match(parts.path):
+            query = parse_qs(parts.query)
+            limit = int(query.get("limit", ["20"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+            return self._send(200, "application/json", mirror.list_body(limit, offset))
+
+        if BATCH_PATH.match(parts.path):
+            query = parse_qs(parts.query)
+            ids = query.get("ids", [""])[0]
+            try:
+                ids = [int(i) for i in ids.split(",") if i]
+            except ValueError:
+                return self._send(400, "text/plain", b"Bad Request")
+            return self._send(200, "application/json", mirror.batch_body(ids))
+
+        match = SPRITE_PATH.match(parts.path)
+        if match:
+            path = mirror.sprite_path(match.group(1))
+            if path:
+                with open(path, "rb") as f:
+                    return self._send(200, "image/png", f.read())
+
+        self._send(404, "text/plain", b"Not Found")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the local Pokédex dataset with PokeAPI's URL shapes")
+    parser.add_argument("--dataset", default=DATASET_PATH)
+    parser.add_argument("--sprites", metavar="DIR", help="directory of <id>.png sprites to serve")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+
+    mirror = DexMirror(load_dataset(args.dataset), args.sprites, args.host, args.port)
+    print(f"Serving {len(mirror.ids)} Pokémon on {mirror.url}")
+    print(f"  POKEAPI_BASE_URL={mirror.url} SPRITE_BASE_URL={mirror.url}")
+    try:
+        mirror.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
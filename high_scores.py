@@ -0,0 +1,110 @@
+import json
+import os
+import sqlite3
+import threading
+
+from perf import timer
+
+# === Store Settings ===
+DB_PATH = os.environ.get("HIGH_SCORES_DB", "high_scores.db")
+# The old whole-file store; imported once when the database is first created
+LEGACY_JSON_PATH = "high_scores.json"
+# How long a writer waits on another process holding the write lock
+BUSY_TIMEOUT_MS = 5000
+
+
+# === High Score Store ===
+# One row per player in SQLite (WAL mode, so readers never block the writer).
+# The index on (wins DESC, player) is the top-N index: SQLite keeps it sorted on
+# every upsert, so the leaderboard is an index range scan no matter how many
+# players there are.
+class HighScoreStore:
+    def __init__(self, path=DB_PATH, legacy_json_path=LEGACY_JSON_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        with self._db:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scores ("
+                " player TEXT PRIMARY KEY,"
+                " wins INTEGER NOT NULL DEFAULT 0)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS scores_by_wins ON scores (wins DESC, player)")
+        if legacy_json_path:
+            self._import_legacy(legacy_json_path)
+
+    def _import_legacy(self, json_path):
+        if self._db.execute("SELECT 1 FROM scores LIMIT 1").fetchone() is not None:
+            return
+        try:
+            with open(json_path, "r") as f:
+                scores = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self.add_many(scores.items())
+
+    def add_wins(self, player, wins):
+        self.add_many([(player, wins)])
+
+    # Several results in one transaction, e.g. from a server flushing a batch
+    def add_many(self, results):
+        with timer("high_scores.write"), self._lock, self._db:
+            self._db.executemany(
+                "INSERT INTO scores (player, wins) VALUES (?, ?)"
+                " ON CONFLICT(player) DO UPDATE SET wins = wins + excluded.wins",
+                results,
+            )
+
+    def get(self, player):
+        with self._lock:
+            row = self._db.execute("SELECT wins FROM scores WHERE player = ?", (player,)).fetchone()
+        return row[0] if row else 0
+
+    def top(self, limit=5):
+        return self.page(limit=limit)
+
+    # Keyset paging: pass the last (player, wins) of the previous page as `after`
+    # so every page costs the same, however deep into the leaderboard it is.
+    def page(self, limit=10, after=None):
+        with timer("high_scores.read"), self._lock:
+            if after is None:
+                return self._db.execute(
+                    "SELECT player, wins FROM scores ORDER BY wins DESC, player LIMIT ?", (limit,)
+                ).fetchall()
+            player, wins = after
+            return self._db.execute(
+                "SELECT player, wins FROM scores"
+                " WHERE wins < ? OR (wins = ? AND player > ?)"
+                " ORDER BY wins DESC, player LIMIT ?",
+                (wins, wins, player, limit),
+            ).fetchall()
+
+    def count(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# === Shared Store ===
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = HighScoreStore()
+    return _store
+
+
+def add_wins(player, wins):
+    get_store().add_wins(player, wins)
+
+
+def top_scores(limit=5):
+    return get_store().top(limit)
@@ -0,0 +1,165 @@
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# === Client Settings ===
+CONNECT_TIMEOUT = float(os.environ.get("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.environ.get("HTTP_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+BACKOFF_SECONDS = 0.25
+MAX_BACKOFF_SECONDS = 4.0
+POOL_SIZE = 8
+# After this many failed requests in a row a host is skipped for a while, so the
+# caches can answer from what they have instead of every call waiting on timeouts.
+FAILURE_THRESHOLD = 5
+RESET_AFTER_SECONDS = 30.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    pass
+
+
+# === Circuit Breaker ===
+class CircuitBreaker:
+    def __init__(self, failure_threshold=FAILURE_THRESHOLD, reset_after=RESET_AFTER_SECONDS):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            # Half-open: let one request through to see if the host is back
+            if time.monotonic() - self.opened_at >= self.reset_after:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+
+# === Pooled HTTP Client ===
+# One keep-alive session for the whole game, with timeouts on every request,
+# a small retry budget with exponential backoff and a breaker per host.
+class HttpClient:
+    def __init__(self, connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT,
+                 max_retries=MAX_RETRIES, backoff=BACKOFF_SECONDS, pool_size=POOL_SIZE,
+                 failure_threshold=FAILURE_THRESHOLD, reset_after=RESET_AFTER_SECONDS):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.requests_sent = 0
+        self.retries = 0
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def breaker(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(self.failure_threshold, self.reset_after)
+                self._breakers[host] = breaker
+            return breaker
+
+    def _sleep_before_retry(self, attempt):
+        delay = min(MAX_BACKOFF_SECONDS, self.backoff * (2 ** attempt))
+        time.sleep(delay * random.uniform(0.5, 1.0))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    # Only used for read-only queries (GraphQL), so retrying a POST is safe here
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def request(self, method, url, **kwargs):
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Too many recent failures talking to {urlsplit(url).netloc}")
+
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            self.requests_sent += 1
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    breaker.record_failure()
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                # Hand the connection back to the pool (matters with stream=True);
+                # raise_for_status only needs the status line
+                response.close()
+                if attempt >= self.max_retries:
+                    breaker.record_failure()
+                    response.raise_for_status()
+
+            self.retries += 1
+            self._sleep_before_retry(attempt)
+            attempt += 1
+
+    def stats(self):
+        return {
+            "requests": self.requests_sent,
+            "retries": self.retries,
+            "open_circuits": [host for host, b in self._breakers.items() if b.is_open],
+        }
+
+    def close(self):
+        self.session.close()
+
+
+# === Shared Client ===
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
+
+
+def get(url, **kwargs):
+    return get_client().get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    return get_client().post(url, **kwargs)
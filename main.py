@@ -1,30 +1,40 @@
-import random
+import queue
+import assets
 import pygame
-import json
-import requests
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from audio import audio
 from typing import List, Dict, Optional, Any
 from pygame.locals import QUIT, MOUSEBUTTONDOWN
 from tkinter import *
 from tkinter import messagebox, simpledialog
 from tkinter.ttk import Progressbar
-
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
-
-# Set up display for Pygame
-SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Pokémon Showdown")
-
-# Load media
-pygame.mixer.music.load('background_music.mp3')
-pygame.mixer.music.play(-1)  # Loop background music
-win_sound = pygame.mixer.Sound('win_sound.wav.mp3')
-lose_sound = pygame.mixer.Sound('lose_sound.wav.mp3')
-battle_background = pygame.image.load("battle_background.png")
-battle_background = pygame.transform.scale(battle_background, (SCREEN_WIDTH, SCREEN_HEIGHT))
+from pokemon_cache import get_pokemon, get_pokemon_batch, sprite_url
+from sprite_cache import get_sprite
+from rules import apply_difficulty, battle_outcome, WIN, LOSE
+from high_scores import add_wins, top_scores
+from scheduler import Flash, Scheduler
+from perf import timed
+from stat_index import get_stat_index, preload as preload_stat_index, stat_ceiling, stat_hint
+from replay import pick_opponent, round_prefetcher, session
+
+# Display size for Pygame
+SCREEN_WIDTH, SCREEN_HEIGHT = assets.SCREEN_SIZE
+
+# Media files
+BACKGROUND_MUSIC = 'background_music.mp3'
+WIN_SOUND = 'win_sound.wav.mp3'
+LOSE_SOUND = 'lose_sound.wav.mp3'
+
+# Pygame display, set up by init_media() when the game starts
+screen = None
+
+# Initialize Pygame and start media (kept out of import so the logic loads headless)
+def init_media():
+    global screen
+    screen = assets.init_display()
+    audio.play_music(BACKGROUND_MUSIC)  # Loop background music
+    audio.preload(WIN_SOUND, LOSE_SOUND)  # Decoded in the background
+    preload_stat_index()  # Percentiles for stat hints and the AI opponent
 
 # Colors
 WHITE = (255, 255, 255)
@@ -37,25 +47,14 @@ music_volume = 1.0  # Default volume (maximum volume)
 # Global difficulty setting (default = Medium)
 difficulty_level = 'medium'
 
-# Function to apply difficulty multiplier to opponent stats
-def apply_difficulty(stats: Dict[str, int], level: str) -> Dict[str, int]:
-    multiplier = {
-        'easy': 0.8,
-        'medium': 1.0,
-        'hard': 1.2
-    }.get(level, 1.0)
-    return {k: int(v * multiplier) for k, v in stats.items()}
-
 # Function to fetch Pokémon data
+@timed("get_pokemon_data")
 def get_pokemon_data(pokemon_id: int, adjust_stats=False) -> Optional[Dict[str, Any]]:
-    url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}"
-    response = requests.get(url)
-    try:
-        pokemon = response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching Pokémon data: {e}")
+    pokemon = get_pokemon(pokemon_id)
+    if pokemon is None:
+        print(f"Error fetching Pokémon data for id {pokemon_id}")
         return None
-    stats = {stat["stat"]["name"]: stat["base_stat"] for stat in pokemon["stats"]}
+    stats = dict(pokemon["stats"])
     if adjust_stats:
         stats = apply_difficulty(stats, difficulty_level)
 
@@ -65,45 +64,43 @@ def get_pokemon_data(pokemon_id: int, adjust_stats=False) -> Optional[Dict[str,
         "height": pokemon["height"],
         "weight": pokemon.get("weight"),
         "stats": stats,
-        "sprite": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon['id']}.png"
+        "sprite": sprite_url(pokemon['id'])
     }
 
-# Flash animation (winner highlight)
+# Timers and animations, advanced from the Tk event loop (see PokemonGame.tick)
+scheduler = Scheduler()
+FRAME_MS = 16
+
+# Flash animation (winner highlight), drawn a frame at a time by the scheduler
 def flash_winner(screen, color=(0, 255, 0), times=3):
-    for _ in range(times):
-        screen.fill(color)
-        pygame.display.update()
-        pygame.time.delay(200)
-        screen.fill((255, 255, 255))
+    def draw(progress):
+        screen.fill(color if flash.on else WHITE)
         pygame.display.update()
-        pygame.time.delay(200)
+    flash = Flash(scheduler, color, times=times, interval=200)
+    scheduler.tween(flash.tween.duration, draw)
+    return flash
 
 # Function to load Pokémon images
+@timed("load_pokemon_image")
 def load_pokemon_image(url: str) -> Optional[pygame.Surface]:
-    try:
-        response = requests.get(url)
-        image = pygame.image.load(BytesIO(response.content))
-        return pygame.transform.scale(image, (200, 200))  # Resize for display
-    except Exception as e:
-        print(f"Failed to load Pokémon image: {e}")
-        return None
+    return get_sprite(url, (200, 200))  # Cached, already resized for display
 
+# Warm a Pokémon's data and sprite ahead of time (runs on prefetch threads)
+def warm_pokemon(pokemon_id: int):
+    pokemon = get_pokemon_data(pokemon_id)
+    if pokemon:
+        load_pokemon_image(pokemon["sprite"])
 
-# Function to update high scores
-def update_high_scores(player_name: str, wins: int):
-    try:
-        with open("high_scores.json", "r") as file:
-            high_scores = json.load(file)
-    except FileNotFoundError:
-        high_scores = {}
+prefetcher = round_prefetcher(warm_pokemon, warm_batch=get_pokemon_batch)
 
-    if player_name in high_scores:
-        high_scores[player_name] += wins
-    else:
-        high_scores[player_name] = wins
+# Anything that may touch the network runs here, never on the Tk thread;
+# results are handed back through PokemonGame.call_soon
+fetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fetch")
 
-    with open("high_scores.json", "w") as file:
-        json.dump(high_scores, file)
+
+# Function to update high scores
+def update_high_scores(player_name: str, wins: int):
+    add_wins(player_name, wins)
 
 # Main Game Class
 class PokemonGame:
@@ -116,9 +113,60 @@ class PokemonGame:
         self.wins = 0
         self.losses = 0
         self.ties = 0
+        # Callbacks from worker threads, run on the Tk thread by tick()
+        self.ui_calls = queue.Queue()
 
         # Start the game
         self.start_game()
+        self.tick()
+
+    # Runs every frame on the Tk thread.  The next tick is booked first so the
+    # pygame window keeps being pumped even while a dialog opened below is up.
+    def tick(self):
+        self.root.after(FRAME_MS, self.tick)
+        scheduler.update()
+        self.pump_pygame()
+        self.run_ui_calls()
+
+    # The pygame window has no loop of its own here; drain its events so the
+    # OS never marks it as not responding
+    def pump_pygame(self):
+        if not pygame.display.get_init():
+            return
+        for event in pygame.event.get():
+            if event.type == QUIT:
+                self.root.quit()
+
+    def call_soon(self, fn, *args):
+        self.ui_calls.put((fn, args))
+
+    def run_ui_calls(self):
+        while True:
+            try:
+                fn, args = self.ui_calls.get_nowait()
+            except queue.Empty:
+                return
+            fn(*args)
+
+    # Run `work` on the fetch pool and hand its result to `on_done` on the Tk thread
+    def run_in_background(self, work, on_done, on_error=None):
+        def finished(future):
+            error = future.exception()
+            if error is None:
+                self.call_soon(on_done, future.result())
+            else:
+                self.call_soon(on_error or self.show_error, error)
+        fetch_pool.submit(work).add_done_callback(finished)
+
+    def show_error(self, error):
+        messagebox.showerror("Network Problem", f"Couldn't load Pokémon:\n{error}")
+        self.start_game()
+
+    @staticmethod
+    def set_progress(bar, value):
+        # The screen may have moved on while the worker was still reporting
+        if bar.winfo_exists():
+            bar['value'] = value
 
     def start_game(self):
         # Clear the screen
@@ -160,43 +208,60 @@ class PokemonGame:
     def toggle_music(self):
         global background_music_enabled
         background_music_enabled = not background_music_enabled
+        audio.set_music_enabled(background_music_enabled)
         if background_music_enabled:
-            pygame.mixer.music.play(-1, 0.0)  # Start music if enabled
             self.toggle_music_button.config(text="Stop Music")  # Update button text
         else:
-            pygame.mixer.music.stop()  # Stop music if disabled
             self.toggle_music_button.config(text="Play Music")  # Update button text
 
     def increase_volume(self):
         global music_volume
         if music_volume < 1.0:
             music_volume += 0.1
-            pygame.mixer.music.set_volume(music_volume)
+            audio.set_music_volume(music_volume)
             self.volume_label.config(text=f"Volume: {int(music_volume * 100)}%")  # Update volume label
 
     def decrease_volume(self):
         global music_volume
         if music_volume > 0.0:
             music_volume -= 0.1
-            pygame.mixer.music.set_volume(music_volume)
+            audio.set_music_volume(music_volume)
             self.volume_label.config(text=f"Volume: {int(music_volume * 100)}%")  # Update volume label
 
     # Function to show high scores
     def show_high_scores(self):
-        try:
-          with open("high_scores.json", "r") as f:
-            scores = json.load(f)
-            top_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
-            message = "\n".join([f"{name}: {score}" for name, score in top_scores])
+        scores = top_scores(5)
+        if scores:
+            message = "\n".join([f"{name}: {score}" for name, score in scores])
             messagebox.showinfo("High Scores", message)
-        except FileNotFoundError:
+        else:
             messagebox.showinfo("High Scores", "No high scores yet!")
 
     def play_game(self):
         # Clear the screen for the game
         self.clear_screen()
-
-        available_pokemon = [get_pokemon_data(random.randint(1, 151)) for _ in range(3)]
+        bar = self.show_stat_bar(self.root, "Loading Pokémon...", 0, maximum=prefetcher.choices)
+
+        # Fetch (or wait for the prefetched) choices and their sprites off the Tk thread
+        def load():
+            available_pokemon = []
+            choices = prefetcher.next_choices()
+            session.record_choices(choices)
+            for pokemon_id in choices:
+                pokemon = get_pokemon_data(pokemon_id)
+                if pokemon:
+                    load_pokemon_image(pokemon["sprite"])
+                available_pokemon.append(pokemon)
+                self.call_soon(self.set_progress, bar, len(available_pokemon))
+            return available_pokemon
+
+        self.run_in_background(load, self.show_choices)
+
+    def show_choices(self, available_pokemon: List[Optional[Dict[str, Any]]]):
+        if None in available_pokemon:
+            self.show_error("PokeAPI did not return every Pokémon for this round")
+            return
+        self.clear_screen()
         self.display_pokemon(available_pokemon)
 
         # Buttons for Pokémon selection
@@ -213,7 +278,7 @@ class PokemonGame:
                 image = load_pokemon_image(pokemon["sprite"])
                 if image:
                     screen.blit(image, (x_positions[i], 200))  # Display Pokémon images
-                    font = pygame.font.Font(None, 36)
+                    font = assets.font(None, 36)
                     text = font.render(pokemon["name"], True, BLACK)
                     screen.blit(text, (x_positions[i], 400))
 
@@ -226,49 +291,70 @@ class PokemonGame:
     def choose_stat(self, player_pokemon):
         # Ask player to choose a stat
         stats = list(player_pokemon["stats"].keys()) + ["id", "height", "weight"]
-        stat_choice = simpledialog.askstring("Choose Stat", f"Choose a stat:\n{', '.join(stats)}")
+        # Only hint once the index is built; never wait for it on the Tk thread
+        hint = stat_hint(player_pokemon["id"])
+        stat_choice = simpledialog.askstring("Choose Stat", f"Choose a stat:\n{', '.join(stats)}\n{hint}")
 
         if stat_choice:
             self.show_opponent(player_pokemon, stat_choice.lower())
 
-    def show_stat_bar(frame, stat_name, value):
+    # Labelled bar; without a maximum it is a stat scaled to the dex's highest value
+    def show_stat_bar(self, frame, stat_name, value, maximum=None):
         Label(frame, text=stat_name, font=('Arial', 10)).pack()
         bar = Progressbar(frame, orient=HORIZONTAL, length=120, mode='determinate')
+        bar['maximum'] = maximum or stat_ceiling(stat_name)
         bar['value'] = value
-        bar['maximum'] = 200  # Adjust max if needed
         bar.pack(pady=2)
+        return bar
 
 
     def show_opponent(self, player_pokemon, stat_choice):
-        opponent_pokemon = get_pokemon_data(random.randint(1, 151))
+        # Clearing the selection buttons also stops a second battle starting meanwhile
+        self.clear_screen()
+        bar = self.show_stat_bar(self.root, "Your opponent is on the way...", 0, maximum=1)
+
+        def load():
+            # Off the Tk thread it is fine to wait for the stat index build first
+            get_stat_index()
+            opponent_id, uniform_pick = pick_opponent(difficulty_level, stat_choice)
+            opponent_pokemon = get_pokemon_data(opponent_id)
+            self.call_soon(self.set_progress, bar, 1)
+            return opponent_pokemon, uniform_pick
+
+        self.run_in_background(load, lambda result: self.battle(player_pokemon, stat_choice, *result))
+
+    def battle(self, player_pokemon, stat_choice, opponent_pokemon, uniform_pick=False):
+        if opponent_pokemon is None:
+            self.show_error("PokeAPI did not return the opponent")
+            return
         messagebox.showinfo("Opponent", f"Opponent's Pokémon: {opponent_pokemon['name']}")
 
         player_value = player_pokemon["stats"].get(stat_choice, 0)
         opponent_value = opponent_pokemon["stats"].get(stat_choice, 0)
 
         result = ""
-        if player_value > opponent_value:
+        outcome = battle_outcome(player_value, opponent_value)
+        session.record_round(player_pokemon["id"], opponent_pokemon["id"], stat_choice, difficulty_level, outcome,
+                             player_value, opponent_value, adjusted=False, uniform_pick=uniform_pick)
+        if outcome == WIN:
             result = "You win!"
             self.wins += 1
-            win_sound.play()
-        elif player_value < opponent_value:
+            audio.play(WIN_SOUND)
+        elif outcome == LOSE:
             result = "You lose!"
             self.losses += 1
-            lose_sound.play()
+            audio.play(LOSE_SOUND)
         else:
             result = "It's a tie!"
             self.ties += 1
 
-        # Stop music before showing result
-        if background_music_enabled:
-            pygame.mixer.music.stop()  # Stop the background music during result display
-        
+        # Duck the background music under the result instead of restarting it
+        audio.duck()
+
         # Show the result (win/lose/tie)
         messagebox.showinfo("Result", result)
 
-        # Restart music after result
-        if background_music_enabled:
-            pygame.mixer.music.play(-1, 0.0)  # Start playing the background music again
+        audio.unduck()
 
         update_high_scores(self.player_name, self.wins)
 
@@ -282,7 +368,7 @@ class PokemonGame:
     def show_summary(self):
         # Stop music when player doesn't want to play again
         if background_music_enabled:
-            pygame.mixer.music.stop()  # Stop the music when game ends
+            audio.stop_music()  # Stop the music when game ends
 
         self.clear_screen()
         summary_text = f"Game Over\nWins: {self.wins}\nLosses: {self.losses}\nTies: {self.ties}"
@@ -295,6 +381,7 @@ class PokemonGame:
 
 # Start the Tkinter GUI
 def main():
+    init_media()
     root = Tk()
     game = PokemonGame(root)
     root.mainloop()
@@ -0,0 +1,130 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+# === Settings ===
+# Set SHOWDOWN_TRACE=trace.jsonl to also stream every sample to a file
+TRACE_PATH = os.environ.get("SHOWDOWN_TRACE")
+# Percentiles are taken over the most recent samples of each timer
+WINDOW = 1024
+
+
+# === Timer Samples ===
+class Histogram:
+    def __init__(self, window=WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total_ms += ms
+
+    def percentile(self, q):
+        ordered = sorted(self.samples)
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))]
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p99_ms": self.percentile(0.99),
+        }
+
+
+# === Metrics Registry ===
+# Named timers (ms) and counters for the hot paths.  Cheap enough to leave on:
+# one perf_counter pair and a deque append per sample.
+class Metrics:
+    def __init__(self, trace_path=TRACE_PATH):
+        self.timers = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+        self._trace = None
+        if trace_path:
+            self.start_trace(trace_path)
+
+    def record(self, name, ms):
+        histogram = self.timers.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.timers.setdefault(name, Histogram())
+        histogram.add(ms)
+        if self._trace is not None:
+            self._write({"t": time.time(), "timer": name, "ms": round(ms, 4)})
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        def decorate(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorate
+
+    def summary(self, name):
+        histogram = self.timers.get(name)
+        return histogram.summary() if histogram else None
+
+    def hit_rate(self, prefix):
+        hits = self.counters.get(prefix + ".hit", 0)
+        misses = self.counters.get(prefix + ".miss", 0)
+        return hits / (hits + misses) if hits + misses else None
+
+    def snapshot(self):
+        return {
+            "timers": {name: h.summary() for name, h in list(self.timers.items())},
+            "counters": dict(self.counters),
+        }
+
+    # === JSONL Trace ===
+    def start_trace(self, path):
+        self._trace = open(path, "a", buffering=64 * 1024)
+        atexit.register(self.stop_trace)
+
+    def _write(self, entry):
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            if self._trace is not None:
+                self._trace.write(line)
+
+    def stop_trace(self):
+        with self._lock:
+            if self._trace is not None:
+                self._trace.write(json.dumps({"t": time.time(), "snapshot": self.snapshot()}) + "\n")
+                self._trace.close()
+                self._trace = None
+
+    def export_jsonl(self, path):
+        with open(path, "a") as f:
+            f.write(json.dumps({"t": time.time(), "snapshot": self.snapshot()}) + "\n")
+
+
+metrics = Metrics()
+timer = metrics.timer
+timed = metrics.timed
+incr = metrics.incr
@@ -0,0 +1,66 @@
+import time
+
+import pygame
+
+from perf import metrics
+
+# === Performance HUD ===
+# Toggleable overlay with FPS, p50/p99 of the hot-path timers and cache hit
+# rates.  The panel is re-rendered at most every REFRESH_MS so showing it
+# doesn't noticeably change the frame times it reports.
+HUD_TIMERS = (
+    "frame",
+    "get_pokemon_data",
+    "load_pokemon_image",
+    "draw_text",
+    "net.pokemon",
+    "net.pokemon_batch",
+    "net.sprite",
+    "sprite.decode",
+    "high_scores.write",
+)
+HUD_CACHES = ("pokemon_cache", "sprite_cache")
+REFRESH_MS = 250
+PANEL_COLOR = (0, 0, 0, 170)
+TEXT_COLOR = (230, 255, 230)
+
+
+class PerfHUD:
+    def __init__(self, font, clock=None):
+        self.font = font
+        self.clock = clock
+        self.visible = False
+        self._surface = None
+        self._built_at = 0.0
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._surface = None
+
+    def lines(self):
+        lines = []
+        if self.clock is not None:
+            lines.append(f"FPS {self.clock.get_fps():5.1f}")
+        for name in HUD_TIMERS:
+            summary = metrics.summary(name)
+            if summary:
+                lines.append(f"{name:<18} p50 {summary['p50_ms']:7.2f}  p99 {summary['p99_ms']:7.2f} ms")
+        for name in HUD_CACHES:
+            rate = metrics.hit_rate(name)
+            if rate is not None:
+                lines.append(f"{name:<18} hit {rate:6.1%}")
+        return lines
+
+    def surface(self):
+        now = time.monotonic() * 1000
+        if self._surface is None or now - self._built_at >= REFRESH_MS:
+            rendered = [self.font.render(line, True, TEXT_COLOR) for line in self.lines()]
+            line_height = self.font.get_linesize()
+            width = max([r.get_width() for r in rendered] + [1]) + 12
+            panel = pygame.Surface((width, line_height * len(rendered) + 12), pygame.SRCALPHA)
+            panel.fill(PANEL_COLOR)
+            for i, r in enumerate(rendered):
+                panel.blit(r, (6, 6 + i * line_height))
+            self._surface = panel
+            self._built_at = now
+        return self._surface
@@ -0,0 +1,177 @@
+import codecs
+import json
+import re
+
+# === Field Projection ===
+# Pulls a handful of top-level fields out of a JSON object as it streams in,
+# without ever building the rest of it.  Unwanted values (moves, game_indices,
+# sprite variants...) are skipped by jumping between brackets and string ends
+# with regexes, and their text is dropped as soon as it has been scanned, so
+# peak memory stays around one network chunk instead of the whole body plus
+# its parsed tree.  Once every wanted field has been seen, reading stops.
+POKEMON_FIELDS = ("id", "name", "height", "weight", "stats")
+CHUNK_SIZE = 16 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_SPECIAL = re.compile(r'[{}\[\]"]')
+_STRING_REST = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+_SCALAR_END = re.compile(r"[,}\] \t\n\r]")
+
+
+class ProjectionError(ValueError):
+    pass
+
+
+class FieldProjector:
+    def __init__(self, fields):
+        self.wanted = set(fields)
+        self.result = {}
+        self.done = False
+        self._buf = ""
+        self._pos = 0
+        self._state = "start"
+        self._key = None
+        # Progress through the value currently being scanned
+        self._value_start = None
+        self._scan_pos = None
+        self._depth = 0
+
+    def feed(self, text):
+        self._buf += text
+        while not self.done and self._step():
+            pass
+        return self.done
+
+    def _skip_ws(self):
+        self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+        return self._pos < len(self._buf)
+
+    def _step(self):
+        if not self._skip_ws():
+            return False
+        char = self._buf[self._pos]
+
+        if self._state == "start":
+            if char != "{":
+                raise ProjectionError("expected a JSON object")
+            self._pos += 1
+            self._state = "key"
+            return True
+
+        if self._state == "key":
+            if char == ",":
+                self._pos += 1
+                return True
+            if char == "}":
+                self.done = True
+                return False
+            if char != '"':
+                raise ProjectionError(f"unexpected {char!r} where a key should be")
+            match = _STRING_REST.match(self._buf, self._pos + 1)
+            if match is None:
+                return False
+            self._key = json.loads(self._buf[self._pos:match.end()])
+            self._pos = match.end()
+            self._state = "colon"
+            return True
+
+        if self._state == "colon":
+            if char != ":":
+                raise ProjectionError("expected ':' after key")
+            self._pos += 1
+            self._state = "value"
+            self._value_start = None
+            return True
+
+        # state == "value"
+        end = self._scan_value()
+        if end is None:
+            if self._key not in self.wanted:
+                # Nothing before the scan position will be needed again; a
+                # scalar cut off by the chunk end is rescanned from its start
+                self._compact(self._pos if self._scan_pos is None else self._scan_pos)
+            return False
+        if self._key in self.wanted:
+            self.result[self._key] = json.loads(self._buf[self._value_start:end])
+            if self.wanted.issubset(self.result):
+                self.done = True
+        self._pos = end
+        self._compact(end)
+        self._state = "key"
+        return True
+
+    def _compact(self, keep_from):
+        shift = keep_from
+        self._buf = self._buf[shift:]
+        self._pos -= shift
+        if self._value_start is not None:
+            self._value_start -= shift
+        if self._scan_pos is not None:
+            self._scan_pos -= shift
+
+    # Returns the end index of the value starting at self._pos, or None if
+    # more data is needed (progress is kept so the next chunk resumes).
+    def _scan_value(self):
+        buf = self._buf
+        if self._value_start is None:
+            self._value_start = self._pos
+            self._scan_pos = self._pos
+            self._depth = 0
+            first = buf[self._pos]
+            if first not in '{["':
+                match = _SCALAR_END.search(buf, self._pos)
+                if match is None:
+                    self._value_start = None
+                    self._scan_pos = None
+                    return None
+                return self._finish(match.start())
+
+        pos = self._scan_pos
+        while True:
+            match = _SPECIAL.search(buf, pos)
+            if match is None:
+                self._scan_pos = len(buf)
+                return None
+            char = match.group()
+            if char == '"':
+                string_end = _STRING_REST.match(buf, match.end())
+                if string_end is None:
+                    self._scan_pos = match.start()
+                    return None
+                pos = string_end.end()
+                if self._depth == 0:
+                    return self._finish(pos)
+                continue
+            pos = match.end()
+            self._depth += 1 if char in "{[" else -1
+            if self._depth == 0:
+                return self._finish(pos)
+
+    def _finish(self, end):
+        self._scan_pos = None
+        return end
+
+    # A scalar that ends exactly at the end of the body never sees a delimiter
+    def close(self):
+        if not self.done and self._state == "value" and self._key in self.wanted:
+            self.result[self._key] = json.loads(self._buf[self._pos:])
+        return self.result
+
+
+def project_chunks(chunks, fields):
+    projector = FieldProjector(fields)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    for chunk in chunks:
+        if projector.feed(decoder.decode(chunk)):
+            break
+    else:
+        projector.feed(decoder.decode(b"", final=True))
+    return projector.close()
+
+
+# Project a streamed requests response (get(..., stream=True)) and close it early
+def project_response(response, fields=POKEMON_FIELDS, chunk_size=CHUNK_SIZE):
+    try:
+        return project_chunks(response.iter_content(chunk_size), fields)
+    finally:
+        response.close()
@@ -0,0 +1,337 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import http_client
+from perf import incr, timer
+from pokeapi_projection import POKEMON_FIELDS, project_response
+
+# === Cache Settings ===
+# Both hosts can be pointed at a local stand-in server for offline play and testing
+POKEAPI_BASE_URL = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co").rstrip("/")
+SPRITE_BASE_URL = os.environ.get("SPRITE_BASE_URL", "https://raw.githubusercontent.com").rstrip("/")
+POKEAPI_URL = POKEAPI_BASE_URL + "/api/v2/pokemon/{}"
+SPRITE_URL = SPRITE_BASE_URL + "/PokeAPI/sprites/master/sprites/pokemon/{}.png"
+CACHE_PATH = os.environ.get("POKEMON_CACHE_PATH", "pokemon_cache.db")
+# Bump this whenever the shape of a stored record changes; older rows are refetched.
+CACHE_VERSION = 1
+# Base stats basically never change, so a month is plenty.
+CACHE_TTL = 30 * 24 * 60 * 60
+OFFLINE = os.environ.get("POKEMON_OFFLINE", "") == "1"
+# How a whole set of Pokémon is fetched in one request: PokeAPI's GraphQL
+# endpoint, the local mirror's bulk route (dex_mirror.py), or "off" for one
+# REST call per id.  Defaults to GraphQL against pokeapi.co, the mirror otherwise.
+GRAPHQL_URL = os.environ.get("POKEAPI_GRAPHQL_URL", "https://beta.pokeapi.co/graphql/v1beta")
+BATCH_URL = POKEAPI_BASE_URL + "/api/v2/pokemon-batch?ids={}"
+BATCH_BACKEND = os.environ.get(
+    "POKEAPI_BATCH", "graphql" if POKEAPI_BASE_URL == "https://pokeapi.co" else "mirror"
+)
+BATCH_LIMIT = 200
+NO_BATCH_STATUSES = {404, 405, 501}
+
+
+def sprite_url(pokemon_id):
+    return SPRITE_URL.format(pokemon_id)
+
+
+# === Fetch From PokeAPI ===
+# Only the fields below are kept; the body is streamed through a projector
+# so the moves/game_indices/sprites bulk is never decoded into Python objects.
+def fetch_from_api(pokemon_id):
+    with timer("net.pokemon"):
+        response = http_client.get(POKEAPI_URL.format(pokemon_id), stream=True)
+        if response.status_code != 200:
+            response.close()
+            return None
+        data = project_response(response, POKEMON_FIELDS)
+    return {
+        "name": data["name"],
+        "id": data["id"],
+        "height": data["height"],
+        "weight": data.get("weight"),
+        "stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
+    }
+
+
+# === Batched Fetch ===
+# Each returns the records it found, or None if the backend has no batch support.
+GRAPHQL_QUERY = """
+query ($ids: [Int!]) {
+  pokemon_v2_pokemon(where: {id: {_in: $ids}}) {
+    id name height weight
+    pokemon_v2_pokemonstats { base_stat pokemon_v2_stat { name } }
+  }
+}
+"""
+
+
+def fetch_batch_graphql(ids):
+    with timer("net.pokemon_batch"):
+        response = http_client.post(GRAPHQL_URL, json={"query": GRAPHQL_QUERY, "variables": {"ids": list(ids)}})
+    if response.status_code in NO_BATCH_STATUSES:
+        return None
+    response.raise_for_status()
+    payload = response.json()
+    if payload.get("errors"):
+        raise ValueError(payload["errors"][0].get("message", "GraphQL error"))
+    return [
+        {
+            "name": p["name"],
+            "id": p["id"],
+            "height": p["height"],
+            "weight": p["weight"],
+            "stats": {s["pokemon_v2_stat"]["name"]: s["base_stat"] for s in p["pokemon_v2_pokemonstats"]},
+        }
+        for p in payload["data"]["pokemon_v2_pokemon"]
+    ]
+
+
+def fetch_batch_mirror(ids):
+    with timer("net.pokemon_batch"):
+        response = http_client.get(BATCH_URL.format(",".join(map(str, ids))))
+    if response.status_code in NO_BATCH_STATUSES:
+        return None
+    response.raise_for_status()
+    return response.json()["pokemon"]
+
+
+BATCH_FETCHERS = {"graphql": fetch_batch_graphql, "mirror": fetch_batch_mirror, "off": None}
+
+
+# === Persistent Pokémon Store ===
+# Records are kept in SQLite keyed by Pokémon id, with an in-memory tier in front
+# so repeated lookups inside one process never touch the disk.  Records returned
+# from here are shared: callers copy before changing them.
+class PokemonCache:
+    def __init__(self, path=CACHE_PATH, ttl=CACHE_TTL, offline=OFFLINE, fetcher=fetch_from_api,
+                 batch_fetcher=BATCH_FETCHERS.get(BATCH_BACKEND)):
+        self.path = path
+        self.ttl = ttl
+        self.offline = offline
+        self.fetcher = fetcher
+        self.batch_fetcher = batch_fetcher
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self._memory = {}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pokemon ("
+            " id INTEGER PRIMARY KEY,"
+            " version INTEGER NOT NULL,"
+            " fetched_at REAL NOT NULL,"
+            " data TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def _is_fresh(self, fetched_at):
+        return self.ttl is None or time.time() - fetched_at < self.ttl
+
+    def _load_row(self, pokemon_id):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT version, fetched_at, data FROM pokemon WHERE id = ?", (pokemon_id,)
+            ).fetchone()
+        if row is None or row[0] != CACHE_VERSION:
+            return None
+        return row[1], json.loads(row[2])
+
+    def _load_rows(self, ids):
+        entries = {}
+        with self._lock:
+            for start in range(0, len(ids), BATCH_LIMIT):
+                chunk = ids[start:start + BATCH_LIMIT]
+                placeholders = ",".join("?" * len(chunk))
+                for pokemon_id, version, fetched_at, data in self._db.execute(
+                    f"SELECT id, version, fetched_at, data FROM pokemon WHERE id IN ({placeholders})", chunk
+                ):
+                    if version == CACHE_VERSION:
+                        entries[pokemon_id] = (fetched_at, json.loads(data))
+        return entries
+
+    def _fetch_one(self, pokemon_id):
+        try:
+            return self.fetcher(pokemon_id)
+        except http_client.CircuitOpenError:
+            return None
+        except Exception as e:
+            print(f"Error fetching Pokémon {pokemon_id}: {e}")
+            return None
+
+    def get(self, pokemon_id):
+        entry = self._memory.get(pokemon_id)
+        if entry is None:
+            entry = self._load_row(pokemon_id)
+            if entry is not None:
+                self._memory[pokemon_id] = entry
+
+        if entry is not None and (self.offline or self._is_fresh(entry[0])):
+            self.hits += 1
+            incr("pokemon_cache.hit")
+            return entry[1]
+
+        self.misses += 1
+        incr("pokemon_cache.miss")
+        if self.offline:
+            return None
+
+        record = self._fetch_one(pokemon_id)
+        if record is None:
+            # Expired data beats no data when PokeAPI is unreachable
+            if entry is not None:
+                self.stale_hits += 1
+                return entry[1]
+            return None
+
+        self.put(pokemon_id, record)
+        return record
+
+    def put(self, pokemon_id, record):
+        fetched_at = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pokemon (id, version, fetched_at, data) VALUES (?, ?, ?, ?)",
+                (pokemon_id, CACHE_VERSION, fetched_at, json.dumps(record)),
+            )
+            self._db.commit()
+        self._memory[pokemon_id] = (fetched_at, record)
+
+    # Resolve a whole set at once: duplicates are looked up once, local rows come
+    # from a single query, and everything else from one batched request per
+    # BATCH_LIMIT ids.  Returns one record (or None) per requested id, in order.
+    def get_many(self, ids):
+        ids = list(ids)
+        wanted = list(dict.fromkeys(ids))
+        entries = self._load_rows([i for i in wanted if i not in self._memory])
+
+        found = {}
+        stale = {}
+        missing = []
+        for pokemon_id in wanted:
+            entry = self._memory.get(pokemon_id) or entries.get(pokemon_id)
+            if entry is None:
+                missing.append(pokemon_id)
+                continue
+            self._memory[pokemon_id] = entry
+            if self.offline or self._is_fresh(entry[0]):
+                found[pokemon_id] = entry[1]
+            else:
+                stale[pokemon_id] = entry[1]
+                missing.append(pokemon_id)
+
+        self.hits += len(found)
+        self.misses += len(missing)
+        if found:
+            incr("pokemon_cache.hit", len(found))
+        if missing:
+            incr("pokemon_cache.miss", len(missing))
+
+        if missing and not self.offline:
+            fetched = self._fetch_many(missing)
+            self.put_many(fetched.values())
+            found.update(fetched)
+        for pokemon_id, record in stale.items():
+            if pokemon_id not in found:
+                self.stale_hits += 1
+                found[pokemon_id] = record
+        return [found.get(pokemon_id) for pokemon_id in ids]
+
+    def _fetch_many(self, ids):
+        fetched = {}
+        fallback = []
+        for start in range(0, len(ids), BATCH_LIMIT):
+            chunk = ids[start:start + BATCH_LIMIT]
+            if self.batch_fetcher is None:
+                fallback.extend(chunk)
+                continue
+            try:
+                records = self.batch_fetcher(chunk)
+            except http_client.CircuitOpenError:
+                return fetched
+            except Exception as e:
+                print(f"Error batch fetching {len(chunk)} Pokémon: {e}")
+                fallback.extend(chunk)
+                continue
+            if records is None:
+                # This backend has no batch route; stop asking and go one id at a time
+                self.batch_fetcher = None
+                fallback.extend(chunk)
+                continue
+            wanted = set(chunk)
+            fetched.update((r["id"], r) for r in records if r["id"] in wanted)
+        for pokemon_id in fallback:
+            record = self._fetch_one(pokemon_id)
+            if record is not None:
+                fetched[pokemon_id] = record
+        return fetched
+
+    def put_many(self, records):
+        fetched_at = time.time()
+        records = list(records)
+        with self._lock:
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO pokemon (id, version, fetched_at, data) VALUES (?, ?, ?, ?)",
+                    [(r["id"], CACHE_VERSION, fetched_at, json.dumps(r)) for r in records],
+                )
+        for record in records:
+            self._memory[record["id"]] = (fetched_at, record)
+
+    def warm(self, ids):
+        self.get_many(ids)
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM pokemon")
+            self._db.commit()
+        self._memory.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cached_in_memory": len(self._memory),
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# === Shared Store ===
+# All three entry points go through this one instance so they share a single
+# file.  Prefetch workers and the stat index thread can reach it first, together.
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PokemonCache()
+        return _cache
+
+
+def get_pokemon(pokemon_id):
+    return get_cache().get(pokemon_id)
+
+
+def get_pokemon_batch(ids):
+    return get_cache().get_many(ids)
+
+
+if __name__ == "__main__":
+    from rules import MAX_POKEMON_ID
+
+    # Warm the store for every Pokémon in play so later rounds never hit the network
+    cache = get_cache()
+    cache.warm(range(1, MAX_POKEMON_ID + 1))
+    print(cache.stats())
@@ -0,0 +1,131 @@
+import threading
+from collections.abc import Mapping
+
+from pokemon_cache import get_cache, sprite_url
+from rules import DIFFICULTY_MULTIPLIERS, STAT_NAMES
+
+STAT_INDEX = {name: i for i, name in enumerate(STAT_NAMES)}
+RECORD_FIELDS = frozenset(("id", "name", "height", "weight", "stats", "sprite"))
+
+
+# === Stats View ===
+# Read-only name -> value mapping over a fixed-order stat tuple, so code written
+# against the old `pokemon["stats"]` dicts keeps working without a copy.
+class StatsView(Mapping):
+    __slots__ = ("_values",)
+
+    def __init__(self, values):
+        self._values = values
+
+    def __getitem__(self, name):
+        return self._values[STAT_INDEX[name]]
+
+    def get(self, name, default=None):
+        i = STAT_INDEX.get(name)
+        return default if i is None else self._values[i]
+
+    def __iter__(self):
+        return iter(STAT_NAMES)
+
+    def __len__(self):
+        return len(STAT_NAMES)
+
+    def __repr__(self):
+        return f"StatsView({dict(self)})"
+
+
+# === Pokémon Record ===
+# Immutable; stats live in one tuple in STAT_NAMES order.  Difficulty-adjusted
+# tuples are built the first time a level is asked for and then shared by
+# every caller, which is safe because nobody can write to them.
+class Pokemon:
+    __slots__ = ("id", "name", "height", "weight", "stat_values", "_adjusted")
+
+    def __init__(self, pokemon_id, name, height, weight, stat_values):
+        set_field = object.__setattr__
+        set_field(self, "id", pokemon_id)
+        set_field(self, "name", name)
+        set_field(self, "height", height)
+        set_field(self, "weight", weight)
+        set_field(self, "stat_values", tuple(stat_values))
+        set_field(self, "_adjusted", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Pokemon records are immutable")
+
+    @classmethod
+    def from_record(cls, record):
+        stats = record["stats"]
+        return cls(
+            record["id"],
+            record["name"],
+            record["height"],
+            record.get("weight"),
+            [stats.get(name, 0) for name in STAT_NAMES],
+        )
+
+    @property
+    def stats(self):
+        return StatsView(self.stat_values)
+
+    @property
+    def sprite(self):
+        return sprite_url(self.id)
+
+    def stat(self, name):
+        return self.stat_values[STAT_INDEX[name]]
+
+    def adjusted_values(self, level):
+        values = self._adjusted.get(level)
+        if values is None:
+            multiplier = DIFFICULTY_MULTIPLIERS.get(level, 1.0)
+            values = tuple(int(v * multiplier) for v in self.stat_values)
+            self._adjusted[level] = values
+        return values
+
+    def adjusted_stats(self, level):
+        return StatsView(self.adjusted_values(level))
+
+    # Dict-style access for code that still treats Pokémon as dicts
+    def __getitem__(self, key):
+        if key in RECORD_FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __repr__(self):
+        return f"Pokemon({self.id}, {self.name!r})"
+
+
+# === Interned Registry ===
+# One shared Pokemon object per id for the life of the process.
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def intern_record(record):
+    pokemon = _registry.get(record["id"])
+    if pokemon is not None:
+        return pokemon
+    with _registry_lock:
+        return _registry.setdefault(record["id"], Pokemon.from_record(record))
+
+
+def get_record(pokemon_id, cache=None):
+    pokemon = _registry.get(pokemon_id)
+    if pokemon is not None:
+        return pokemon
+    record = (cache or get_cache()).get(pokemon_id)
+    if record is None:
+        return None
+    return intern_record(record)
+
+
+# Anything not interned yet is resolved with one batched cache lookup
+def load_records(ids, cache=None):
+    ids = list(ids)
+    missing = [pokemon_id for pokemon_id in ids if pokemon_id not in _registry]
+    if missing:
+        for record in (cache or get_cache()).get_many(missing):
+            if record is not None:
+                intern_record(record)
+    return [_registry[pokemon_id] for pokemon_id in ids if pokemon_id in _registry]
@@ -1,25 +1,20 @@
+import time
+import assets
 import pygame
-import random
-import requests
-import json
-from io import BytesIO
-
-# === Initialize Pygame ===
-pygame.init()
-pygame.mixer.init()
+from audio import audio
+from pokemon_cache import get_pokemon, get_pokemon_batch, sprite_url
+from sprite_cache import get_sprite
+from rules import apply_difficulty, battle_outcome, WIN, LOSE
+from render_cache import Renderer, SurfaceCache, solid_surface, text_surface
+from scheduler import Scheduler
+from scenes import idle_timeout, wait_events
+from perf import metrics, timed
+from perf_hud import PerfHUD
+from stat_index import best_stat, preload as preload_stat_index, stat_ceiling, stat_hint
+from replay import pick_opponent, round_prefetcher, session
 
 # === Screen Setup ===
-SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Pokémon Showdown")
-
-# === Load Assets ===
-battle_background = pygame.image.load("battle_background.png")
-battle_background = pygame.transform.scale(battle_background, (SCREEN_WIDTH, SCREEN_HEIGHT))
-
-pygame.mixer.music.load("background_music.mp3")
-win_sound = pygame.mixer.Sound("win_sound.wav.mp3")
-lose_sound = pygame.mixer.Sound("lose_sound.wav.mp3")
+SCREEN_WIDTH, SCREEN_HEIGHT = assets.SCREEN_SIZE
 
 # === Colors & Fonts ===
 WHITE = (255, 255, 255)
@@ -28,26 +23,47 @@ GREEN = (34, 177, 76)
 RED = (200, 0, 0)
 GRAY = (220, 220, 220)
 
-FONT = pygame.font.SysFont("arial", 24)
+# === Renderer ===
+# Everything is drawn through the renderer, which only repaints what changed
+card_cache = SurfaceCache(max_items=64)
+scheduler = Scheduler()
+
+# === Display & Assets ===
+# Created by init_game() on startup, not at import, so the module loads headless
+screen = None
+battle_background = None
+FONT = None
+renderer = None
+hud = None
+
+def init_game():
+    global screen, battle_background, FONT, renderer
+    screen = assets.init_display()
+    battle_background = assets.image("battle_background.png", (SCREEN_WIDTH, SCREEN_HEIGHT))
+    audio.preload(WIN_SOUND, LOSE_SOUND)
+    preload_stat_index()
+    FONT = assets.font("arial", 24)
+    renderer = Renderer(screen, battle_background)
 
 # === Globals ===
+RESULT_DELAY_MS = 3000
+# Screens that only change on input or a timer; the loop sleeps on these
+IDLE_STATES = ("menu", "result")
+BACKGROUND_MUSIC = "background_music.mp3"
+WIN_SOUND = "win_sound.wav.mp3"
+LOSE_SOUND = "lose_sound.wav.mp3"
+
 music_volume = 1.0
 background_music_enabled = True
 difficulty = "medium"
 
-# === Difficulty Modifier ===
-def apply_difficulty(stats, level):
-    multiplier = {"easy": 0.8, "medium": 1.0, "hard": 1.2}.get(level, 1.0)
-    return {k: int(v * multiplier) for k, v in stats.items()}
-
 # === Fetch Pokémon Data ===
+@timed("get_pokemon_data")
 def get_pokemon_data(pokemon_id, adjust_stats=False):
-    url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}"
-    response = requests.get(url)
-    if response.status_code != 200:
+    data = get_pokemon(pokemon_id)
+    if data is None:
         return None
-    data = response.json()
-    stats = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
+    stats = dict(data["stats"])
     if adjust_stats:
         stats = apply_difficulty(stats, difficulty)
     return {
@@ -56,45 +72,92 @@ def get_pokemon_data(pokemon_id, adjust_stats=False):
         "height": data["height"],
         "weight": data["weight"],
         "stats": stats,
-        "sprite": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{data['id']}.png"
+        "sprite": sprite_url(data['id'])
     }
 
 # === Load Pokémon Image ===
+@timed("load_pokemon_image")
 def load_pokemon_image(url):
-    try:
-        img_data = requests.get(url).content
-        image = pygame.image.load(BytesIO(img_data))
-        return pygame.transform.scale(image, (150, 150))
-    except Exception as e:
-        print("Image load failed:", e)
-        return None
+    return get_sprite(url, (150, 150))
+
+# === Prefetch Upcoming Pokémon ===
+def warm_pokemon(pokemon_id):
+    pokemon = get_pokemon_data(pokemon_id)
+    if pokemon:
+        load_pokemon_image(pokemon["sprite"])
+
+prefetcher = round_prefetcher(warm_pokemon, warm_batch=get_pokemon_batch)
 
 # === Draw Text ===
+@timed("draw_text")
 def draw_text(text, x, y, color=BLACK):
-    rendered = FONT.render(text, True, color)
-    screen.blit(rendered, (x, y))
+    renderer.blit(text_surface(text, FONT, color), (x, y))
+
+# === Stat Bar Surface ===
+# Label on top, bar 20px below it; cached per (label, value, max_value).
+# Bars are scaled against the highest value of that stat in the dex (a fixed
+# ceiling until the stat index is ready, which never blocks the frame).
+def stat_bar_surface(label, value, max_value=None):
+    max_value = max_value or stat_ceiling(label)
+
+    def build():
+        label_surface = text_surface(label, FONT, BLACK)
+        surface = pygame.Surface((max(150, label_surface.get_width()), 40), pygame.SRCALPHA)
+        surface.blit(label_surface, (0, 0))
+        surface.fill(GRAY, (0, 20, 150, 20))
+        surface.fill(GREEN, (0, 20, min(150, int((value / max_value) * 150)), 20))
+        return surface
+    return card_cache.get(("bar", label, value, max_value), build)
 
 # === Draw Stat Bar ===
-def draw_stat_bar(x, y, label, value, max_value=200):
-    draw_text(label, x, y - 20)
-    pygame.draw.rect(screen, GRAY, (x, y, 150, 20))
-    pygame.draw.rect(screen, GREEN, (x, y, int((value / max_value) * 150), 20))
+def draw_stat_bar(x, y, label, value, max_value=None):
+    renderer.blit(stat_bar_surface(label, value, max_value), (x, y - 20))
 
-# === Display Pokémon ===
-def display_pokemon(pokemon, x, y):
+# === Pokémon Card ===
+# Sprite, name and stat bars composed once into a single surface
+def pokemon_card(pokemon):
     image = load_pokemon_image(pokemon["sprite"])
-    if image:
-        screen.blit(image, (x, y))
-    draw_text(pokemon["name"], x, y + 160)
     stats = pokemon["stats"]
-    for i, (stat, val) in enumerate(stats.items()):
-        draw_stat_bar(x, y + 190 + i * 30, stat, val)
+
+    def build():
+        name = text_surface(pokemon["name"], FONT, BLACK)
+        bars = [stat_bar_surface(stat, val) for stat, val in stats.items()]
+        width = max([150, name.get_width()] + [bar.get_width() for bar in bars])
+        card = pygame.Surface((width, 170 + len(bars) * 30 + 20), pygame.SRCALPHA)
+        if image:
+            card.blit(image, (0, 0))
+        card.blit(name, (0, 160))
+        for i, bar in enumerate(bars):
+            card.blit(bar, (0, 170 + i * 30))
+        return card
+
+    # Bars get rescaled once the stat index replaces the fallback ceiling
+    ceilings = tuple(stat_ceiling(stat) for stat in stats)
+    key = ("card", pokemon["id"], pokemon["name"], tuple(stats.items()), ceilings, image is not None)
+    return card_cache.get(key, build)
+
+# === Display Pokémon ===
+def display_pokemon(pokemon, x, y):
+    renderer.blit(pokemon_card(pokemon), (x, y))
+
+# === Present Frame ===
+# Puts the performance overlay (F3) on top, then pushes the frame
+def present():
+    if hud is not None and hud.visible:
+        renderer.blit(hud.surface(), (8, 8))
+    renderer.present()
+
+# Time since frame_start is one "frame" sample for the HUD and the trace
+def record_frame(frame_start):
+    metrics.record("frame", (time.perf_counter() - frame_start) * 1000)
 
 # === Game Loop ===
 def main():
-    global music_volume, background_music_enabled, difficulty
+    global music_volume, background_music_enabled, difficulty, hud
+    init_game()
     running = True
     clock = pygame.time.Clock()
+    hud = PerfHUD(assets.font("couriernew", 14), clock)
     state = "menu"
     player_name = ""
     wins = 0
@@ -102,20 +165,33 @@ def main():
     selected_stat = ""
     player_pokemon = None
     opponent_pokemon = None
+    result_text = ""
+    result_timer = None
+    opponent_id = None
+    opponent_ready = None
+    uniform_pick = False
 
     if background_music_enabled:
-        pygame.mixer.music.play(-1)
+        audio.play_music(BACKGROUND_MUSIC)
 
-    # Main game loop
+    # Main game loop: ticks at 30 FPS, except on a static screen already drawn,
+    # where it blocks until input or the next scheduler timer instead
+    idle = False
     while running:
-        screen.blit(battle_background, (0, 0))
+        state_before = state
+        events = wait_events(idle_timeout(scheduler)) if idle else pygame.event.get()
+        frame_start = time.perf_counter()
+        scheduler.update()
         mouse_clicked = False
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
             if event.type == pygame.MOUSEBUTTONDOWN:
                 mouse_clicked = True
             if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    hud.toggle()
+                    continue
                 if state == "menu" and event.unicode.isprintable():
                     player_name += event.unicode
                 if state == "menu" and event.key == pygame.K_BACKSPACE:
@@ -128,18 +204,24 @@ def main():
             draw_text("Enter Your Name:", 300, 200)
             draw_text(player_name, 300, 240)
             draw_text("Press Enter to Start", 300, 300)
+            present()
 
         # === Pokémon Selection ===
         elif state == "select":
-            pokemons = [get_pokemon_data(random.randint(1, 151)) for _ in range(3)]
+            choices = prefetcher.next_choices()
+            session.record_choices(choices)
+            pokemons = [get_pokemon_data(pokemon_id) for pokemon_id in choices]
             for i, pkmn in enumerate(pokemons):
                 display_pokemon(pkmn, 50 + i * 250, 100)
             draw_text("Click to choose your Pokémon", 240, 500)
-            pygame.display.flip()
+            present()
+            # Close the frame here; the wait for a click is the player's time, not ours
+            record_frame(frame_start)
+            frame_start = None
 
             selected = False
             while not selected:
-                for event in pygame.event.get():
+                for event in wait_events():
                     if event.type == pygame.QUIT:
                         running = False
                         selected = True
@@ -150,25 +232,27 @@ def main():
                                 player_pokemon = pokemons[i]
                                 selected = True
                                 break
-                clock.tick(30)
             state = "choose_stat"
 
         # === Stat Choice ===
         elif state == "choose_stat":
-            screen.blit(battle_background, (0, 0))
             draw_text("Choose a stat to battle:", 250, 50)
             stats = list(player_pokemon["stats"].keys())
+            best = (best_stat(player_pokemon["id"]) or (None,))[0]
+            draw_text(stat_hint(player_pokemon["id"]), 250, 420)
             buttons = []
             for i, stat in enumerate(stats):
                 rect = pygame.Rect(300, 100 + i * 50, 200, 40)
-                pygame.draw.rect(screen, RED, rect)
+                renderer.blit(solid_surface(rect.size, GREEN if stat == best else RED), rect.topleft)
                 draw_text(stat, 320, 110 + i * 50)
                 buttons.append((rect, stat))
-            pygame.display.flip()
+            present()
+            record_frame(frame_start)
+            frame_start = None
 
             chosen = False
             while not chosen:
-                for event in pygame.event.get():
+                for event in wait_events():
                     if event.type == pygame.QUIT:
                         running = False
                         chosen = True
@@ -179,37 +263,57 @@ def main():
                                 selected_stat = stat
                                 chosen = True
                                 break
-                clock.tick(30)
+            # The opponent's data and sprite load on the prefetch pool, never in a frame
+            opponent_id, uniform_pick = pick_opponent(difficulty, selected_stat)
+            opponent_ready = prefetcher.warm_one(opponent_id)
             state = "battle"
 
         # === Battle ===
+        elif state == "battle" and not opponent_ready.done():
+            draw_text("Your opponent is on the way...", 250, 280)
+            present()
+
         elif state == "battle":
-            opponent_pokemon = get_pokemon_data(random.randint(1, 151), adjust_stats=True)
-            screen.blit(battle_background, (0, 0))
-            display_pokemon(player_pokemon, 100, 100)
-            display_pokemon(opponent_pokemon, 500, 100)
+            opponent_pokemon = get_pokemon_data(opponent_id, adjust_stats=True)
 
             player_val = player_pokemon["stats"].get(selected_stat, 0)
             opponent_val = opponent_pokemon["stats"].get(selected_stat, 0)
 
-            if player_val > opponent_val:
+            outcome = battle_outcome(player_val, opponent_val)
+            session.record_round(player_pokemon["id"], opponent_id, selected_stat, difficulty, outcome,
+                                 player_val, opponent_val, uniform_pick=uniform_pick)
+            if outcome == WIN:
                 result_text = "You Win!"
                 wins += 1
-                win_sound.play()
-            elif player_val < opponent_val:
+                audio.play(WIN_SOUND)
+            elif outcome == LOSE:
                 result_text = "You Lose!"
                 losses += 1
-                lose_sound.play()
+                audio.play(LOSE_SOUND)
             else:
                 result_text = "It's a Tie!"
 
+            # Show the result for a while without blocking; the next round's
+            # Pokémon keep prefetching in the background meanwhile
+            result_timer = scheduler.after(RESULT_DELAY_MS)
+            state = "result"
+
+        # === Result ===
+        elif state == "result":
+            display_pokemon(player_pokemon, 100, 100)
+            display_pokemon(opponent_pokemon, 500, 100)
             draw_text(result_text, 330, 500)
-            pygame.display.flip()
-            pygame.time.wait(3000)
-            state = "select"
+            present()
+            if result_timer.done:
+                state = "select"
 
-        pygame.display.flip()
-        clock.tick(30)
+        # Unless the state already closed its frame before waiting for input
+        if frame_start is not None:
+            record_frame(frame_start)
+        # The HUD shows live numbers, so keep ticking while it is up
+        idle = state == state_before and state in IDLE_STATES and not hud.visible
+        if not idle:
+            clock.tick(30)
 
     pygame.quit()
 
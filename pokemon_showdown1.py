@@ -1,65 +1,86 @@
+import assets
 import pygame
-import requests
-import json
-import random
-from io import BytesIO
+from audio import audio
 from pygame.locals import *
-
-pygame.init()
-pygame.mixer.init()
+from pokemon_cache import get_pokemon, get_pokemon_batch, sprite_url
+from sprite_cache import get_sprite
+from rules import DIFFICULTY_LEVELS, MAX_POKEMON_ID, apply_difficulty, battle_outcome, WIN, LOSE
+from pokemon_record import load_records
+from deck_game import DeckGame, OPPONENT, PLAYER
+from stat_index import preload as preload_stat_index, stat_hint
+from replay import deck_rng, pick_opponent, round_prefetcher, session
+from high_scores import add_wins, top_scores
+from scheduler import Flash, Scheduler
+from scenes import Scene, SceneStack
 
 # === GLOBALS ===
-SCREEN_WIDTH, SCREEN_HEIGHT = 800, 600
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Pokémon Showdown")
+SCREEN_WIDTH, SCREEN_HEIGHT = assets.SCREEN_SIZE
 
-font = pygame.font.SysFont("Arial", 28)
-small_font = pygame.font.SysFont("Arial", 20)
 clock = pygame.time.Clock()
+scheduler = Scheduler()
 
 background_color = (240, 240, 255)
 button_color = (100, 149, 237)
 hover_color = (65, 105, 225)
 text_color = (0, 0, 0)
 
+# Display & fonts: loaded by init_game() when the game starts
+screen = None
+font = None
+small_font = None
+
 # Music & sounds
-pygame.mixer.music.load("background_music.mp3")
-win_sound = pygame.mixer.Sound("win_sound.wav.mp3")
-lose_sound = pygame.mixer.Sound("lose_sound.wav.mp3")
-pygame.mixer.music.play(-1)
+BACKGROUND_MUSIC = "background_music.mp3"
+WIN_SOUND = "win_sound.wav.mp3"
+LOSE_SOUND = "lose_sound.wav.mp3"
 
 music_enabled = True
 music_volume = 1.0
 difficulty = "medium"
 
-high_scores_file = "high_scores.json"
+def init_game():
+    global screen, font, small_font
+    screen = assets.init_display()
+    font = assets.font("Arial", 28)
+    small_font = assets.font("Arial", 20)
+    audio.preload(WIN_SOUND, LOSE_SOUND)
+    audio.play_music(BACKGROUND_MUSIC)
+    preload_stat_index()
 
 # === HELPERS ===
-def draw_text(text, x, y, font=font, color=text_color):
-    rendered = font.render(text, True, color)
+def draw_text(text, x, y, text_font=None, color=text_color):
+    rendered = (text_font or font).render(text, True, color)
     screen.blit(rendered, (x, y))
 
-def button(text, x, y, w, h, action=None):
-    mouse = pygame.mouse.get_pos()
-    click = pygame.mouse.get_pressed()
-    is_hover = x < mouse[0] < x + w and y < mouse[1] < y + h
-    pygame.draw.rect(screen, hover_color if is_hover else button_color, (x, y, w, h))
-    draw_text(text, x + 20, y + 10)
-    if is_hover and click[0] == 1 and action:
-        pygame.time.wait(200)
-        action()
+# Buttons fire once per mouse press (from the event queue), not while held down.
+# `text` may be a function so labels like "Music: On" stay current.
+class Button:
+    def __init__(self, text, x, y, w, h, action=None):
+        self.text = text
+        self.rect = pygame.Rect(x, y, w, h)
+        self.action = action
+
+    def draw(self):
+        is_hover = self.rect.collidepoint(pygame.mouse.get_pos())
+        pygame.draw.rect(screen, hover_color if is_hover else button_color, self.rect)
+        label = self.text() if callable(self.text) else self.text
+        draw_text(label, self.rect.x + 20, self.rect.y + 10)
+
+    def handle_event(self, event):
+        if event.type == MOUSEBUTTONDOWN and event.button == 1 and self.rect.collidepoint(event.pos):
+            if self.action:
+                self.action()
 
 def fetch_pokemon(pokemon_id, adjusted=False):
-    url = f"https://pokeapi.co/api/v2/pokemon/{pokemon_id}"
     try:
-        data = requests.get(url).json()
-        stats = {s["stat"]["name"]: s["base_stat"] for s in data["stats"]}
+        data = get_pokemon(pokemon_id)
+        stats = dict(data["stats"])
         if adjusted:
-            multiplier = {'easy': 0.8, 'medium': 1.0, 'hard': 1.2}[difficulty]
-            stats = {k: int(v * multiplier) for k, v in stats.items()}
-        sprite = f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{pokemon_id}.png"
+            stats = apply_difficulty(stats, difficulty)
+        sprite = sprite_url(pokemon_id)
         return {
             "name": data["name"].capitalize(),
+            "id": data["id"],
             "stats": stats,
             "sprite": sprite
         }
@@ -67,201 +88,318 @@ def fetch_pokemon(pokemon_id, adjusted=False):
         return None
 
 def load_image(url):
-    try:
-        response = requests.get(url)
-        return pygame.transform.scale(pygame.image.load(BytesIO(response.content)), (150, 150))
-    except:
-        return None
-
-def update_high_scores(player, wins):
-    try:
-        with open(high_scores_file, "r") as f:
-            scores = json.load(f)
-    except FileNotFoundError:
-        scores = {}
-    scores[player] = scores.get(player, 0) + wins
-    with open(high_scores_file, "w") as f:
-        json.dump(scores, f)
-
-def load_high_scores():
-    try:
-        with open(high_scores_file, "r") as f:
-            return json.load(f)
-    except:
-        return {}
-
-# === GAME SCREENS ===
-def main_menu():
-    running = True
-    while running:
-        screen.fill(background_color)
-        draw_text("Pokémon Showdown", 280, 80)
-
-        button("Start Game", 320, 160, 180, 50, start_game)
-        button("Settings", 320, 230, 180, 50, settings_menu)
-        button("High Scores", 320, 300, 180, 50, show_high_scores)
-        button("Quit", 320, 370, 180, 50, quit_game)
-
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                running = False
+    return get_sprite(url, (150, 150))
 
-        pygame.display.update()
-        clock.tick(60)
+def warm_pokemon(pokemon_id):
+    pkm = fetch_pokemon(pokemon_id)
+    if pkm:
+        load_image(pkm["sprite"])
 
-def settings_menu():
-    global music_enabled, music_volume, difficulty
+prefetcher = round_prefetcher(warm_pokemon, warm_batch=get_pokemon_batch)
 
-    running = True
-    while running:
-        screen.fill((220, 220, 250))
-        draw_text("Settings", 340, 60)
-
-        button(f"Music: {'On' if music_enabled else 'Off'}", 300, 140, 200, 50, toggle_music)
-        button(f"Volume: {int(music_volume * 100)}%", 300, 210, 200, 50, adjust_volume)
-        button(f"Difficulty: {difficulty.capitalize()}", 300, 280, 200, 50, cycle_difficulty)
-        button("Back", 300, 350, 200, 50, main_menu)
-
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
+def update_high_scores(player, wins):
+    add_wins(player, wins)
 
-        pygame.display.update()
-        clock.tick(60)
+# === GAME SCREENS ===
+class MenuScene(Scene):
+    title = ""
+    title_pos = (0, 0)
+    fill_color = background_color
+
+    def __init__(self):
+        self.buttons = []
+
+    def handle_event(self, event):
+        for b in self.buttons:
+            b.handle_event(event)
+
+    def draw(self, surface):
+        surface.fill(self.fill_color)
+        draw_text(self.title, *self.title_pos)
+        for b in self.buttons:
+            b.draw()
+
+class MainMenuScene(MenuScene):
+    title = "Pokémon Showdown"
+    title_pos = (280, 80)
+
+    def __init__(self):
+        super().__init__()
+        self.buttons = [
+            Button("Start Game", 320, 150, 180, 50, self.start_game),
+            Button("Deck Mode", 320, 210, 180, 50, self.start_deck_game),
+            Button("Settings", 320, 270, 180, 50, lambda: self.stack.push(SettingsScene())),
+            Button("High Scores", 320, 330, 180, 50, lambda: self.stack.push(HighScoresScene())),
+            Button("Quit", 320, 390, 180, 50, quit_game),
+        ]
+
+    def start_game(self):
+        scene = start_game()
+        if scene:
+            self.stack.push(scene)
+
+    def start_deck_game(self):
+        player_name = input_dialog("Enter your name:")
+        if player_name:
+            self.stack.push(DeckScene(player_name))
+
+class SettingsScene(MenuScene):
+    title = "Settings"
+    title_pos = (340, 60)
+    fill_color = (220, 220, 250)
+
+    def __init__(self):
+        super().__init__()
+        self.buttons = [
+            Button(lambda: f"Music: {'On' if music_enabled else 'Off'}", 300, 140, 200, 50, toggle_music),
+            Button(lambda: f"Volume: {int(music_volume * 100)}%", 300, 210, 200, 50, adjust_volume),
+            Button(lambda: f"Difficulty: {difficulty.capitalize()}", 300, 280, 200, 50, cycle_difficulty),
+            Button("Back", 300, 350, 200, 50, lambda: self.stack.pop()),
+        ]
 
 def toggle_music():
     global music_enabled
     music_enabled = not music_enabled
-    if music_enabled:
-        pygame.mixer.music.play(-1)
-    else:
-        pygame.mixer.music.stop()
+    audio.set_music_enabled(music_enabled)
 
 def adjust_volume():
     global music_volume
     music_volume = (music_volume + 0.1) % 1.1
-    pygame.mixer.music.set_volume(music_volume)
+    audio.set_music_volume(music_volume)
 
 def cycle_difficulty():
     global difficulty
-    levels = ["easy", "medium", "hard"]
-    idx = (levels.index(difficulty) + 1) % 3
-    difficulty = levels[idx]
-
-def show_high_scores():
-    scores = load_high_scores()
-    sorted_scores = sorted(scores.items(), key=lambda x: x[1], reverse=True)[:5]
+    idx = (DIFFICULTY_LEVELS.index(difficulty) + 1) % len(DIFFICULTY_LEVELS)
+    difficulty = DIFFICULTY_LEVELS[idx]
 
-    running = True
-    while running:
-        screen.fill(background_color)
-        draw_text("High Scores", 330, 60)
+class HighScoresScene(MenuScene):
+    title = "High Scores"
+    title_pos = (330, 60)
 
-        for i, (name, score) in enumerate(sorted_scores):
-            draw_text(f"{name}: {score}", 320, 130 + i * 40)
+    def __init__(self):
+        super().__init__()
+        self.buttons = [Button("Back", 320, 400, 160, 50, lambda: self.stack.pop())]
+        self.sorted_scores = []
 
-        button("Back", 320, 400, 160, 50, main_menu)
+    def enter(self):
+        self.sorted_scores = top_scores(5)
 
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-
-        pygame.display.update()
-        clock.tick(60)
+    def draw(self, surface):
+        super().draw(surface)
+        for i, (name, score) in enumerate(self.sorted_scores):
+            draw_text(f"{name}: {score}", 320, 130 + i * 40)
 
+# Ask for the player's name; returns the selection scene, or None if cancelled
 def start_game():
     player_name = input_dialog("Enter your name:")
     if not player_name:
-        return
-
-    # Pokémon Selection
-    player_choices = [fetch_pokemon(random.randint(1, 151)) for _ in range(3)]
-
-    running = True
-    while running:
-        screen.fill(background_color)
+        return None
+    return SelectScene(player_name)
+
+class SelectScene(Scene):
+    x_positions = [100, 325, 550]
+
+    def __init__(self, player_name):
+        self.player_name = player_name
+        self.player_choices = []
+
+    def enter(self):
+        # Pokémon Selection
+        choices = prefetcher.next_choices()
+        session.record_choices(choices)
+        self.player_choices = [fetch_pokemon(pokemon_id) for pokemon_id in choices]
+
+    def handle_event(self, event):
+        if event.type != MOUSEBUTTONDOWN:
+            return
+        mx, my = event.pos
+        for i, x in enumerate(self.x_positions):
+            if x < mx < x + 150 and 100 < my < 250:
+                stat_choice = stat_dialog(self.player_choices[i])
+                if stat_choice:
+                    self.stack.replace(ResultScene(self.player_name, self.player_choices[i], stat_choice))
+                else:
+                    self.stack.pop()
+                return
+
+    def draw(self, surface):
+        surface.fill(background_color)
         draw_text("Choose Your Pokémon", 280, 40)
-        x_positions = [100, 325, 550]
-
-        for i, pkm in enumerate(player_choices):
+        for i, pkm in enumerate(self.player_choices):
             img = load_image(pkm["sprite"])
             if img:
-                screen.blit(img, (x_positions[i], 100))
-            draw_text(pkm["name"], x_positions[i], 260)
-
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
-            if event.type == MOUSEBUTTONDOWN:
-                mx, my = pygame.mouse.get_pos()
-                for i, x in enumerate(x_positions):
-                    if x < mx < x + 150 and 100 < my < 250:
-                        stat_choice = stat_dialog(player_choices[i])
-                        if stat_choice:
-                            battle(player_name, player_choices[i], stat_choice)
-                        return
-
-        pygame.display.update()
-        clock.tick(60)
+                surface.blit(img, (self.x_positions[i], 100))
+            draw_text(pkm["name"], self.x_positions[i], 260)
 
 def input_dialog(prompt):
     from tkinter import simpledialog, Tk
     root = Tk()
     root.withdraw()
-    return simpledialog.askstring("Input", prompt)
+    try:
+        return simpledialog.askstring("Input", prompt)
+    finally:
+        root.destroy()
 
 def stat_dialog(pokemon):
     stats = list(pokemon["stats"].keys())
+    prompt = f"Choose one: {', '.join(stats)}\n{stat_hint(pokemon['id'])}"
     from tkinter import simpledialog, Tk
     root = Tk()
     root.withdraw()
-    return simpledialog.askstring("Choose Stat", f"Choose one: {', '.join(stats)}")
+    try:
+        return simpledialog.askstring("Choose Stat", prompt)
+    finally:
+        root.destroy()
 
-def battle(player_name, player_pokemon, stat):
-    opponent = fetch_pokemon(random.randint(1, 151), adjusted=True)
+def battle(player_name, player_pokemon, stat, opponent_id, uniform_pick):
+    opponent = fetch_pokemon(opponent_id, adjusted=True)
     player_val = player_pokemon["stats"].get(stat, 0)
     opponent_val = opponent["stats"].get(stat, 0)
 
     result = ""
-    if player_val > opponent_val:
+    outcome = battle_outcome(player_val, opponent_val)
+    session.record_round(player_pokemon["id"], opponent_id, stat, difficulty, outcome, player_val, opponent_val,
+                         uniform_pick=uniform_pick)
+    if outcome == WIN:
         result = "You Win!"
-        win_sound.play()
+        audio.play(WIN_SOUND)
         update_high_scores(player_name, 1)
-    elif player_val < opponent_val:
+    elif outcome == LOSE:
         result = "You Lose!"
-        lose_sound.play()
+        audio.play(LOSE_SOUND)
     else:
         result = "It's a Tie!"
+    return result
+
+class ResultScene(MenuScene):
+    def __init__(self, player_name, player_pokemon, stat):
+        super().__init__()
+        self.player_name = player_name
+        self.player_pokemon = player_pokemon
+        self.stat = stat
+        self.result = ""
+        self.flash = None
+        self.buttons = [
+            Button("Play Again", 300, 300, 200, 50, self.play_again),
+            Button("Main Menu", 300, 370, 200, 50, lambda: self.stack.pop()),
+        ]
+
+    # The opponent's data loads on the prefetch pool; frames keep coming
+    # (animating) until it is there, and only then is the round resolved
+    def enter(self):
+        self.opponent_id, self.uniform_pick = pick_opponent(difficulty, self.stat)
+        self.opponent_ready = prefetcher.warm_one(self.opponent_id)
+        self.title = "Your opponent is on the way..."
+        self.title_pos = (250, 200)
+        self.animating = True
+
+    def update(self):
+        if self.flash is not None or not self.opponent_ready.done():
+            return
+        self.animating = False
+        self.result = battle(self.player_name, self.player_pokemon, self.stat, self.opponent_id, self.uniform_pick)
+        self.title = self.result
+        self.title_pos = (330, 200)
+        # Flash screen (animated frame by frame, so input keeps flowing)
+        self.flash = Flash(scheduler, (0, 255, 0) if "Win" in self.result else (255, 0, 0), times=2, interval=150)
+
+    def exit(self):
+        if self.flash is not None:
+            self.flash.tween.cancel()
+
+    def play_again(self):
+        scene = start_game()
+        if scene:
+            self.stack.replace(scene)
+        else:
+            self.stack.pop()
+
+    def handle_event(self, event):
+        if self.flash is not None and not self.flash.active:
+            super().handle_event(event)
+
+    def draw(self, surface):
+        if self.flash is None:
+            surface.fill(background_color)
+            draw_text(self.title, *self.title_pos)
+        elif self.flash.active:
+            surface.fill(self.flash.color if self.flash.on else background_color)
+        else:
+            super().draw(surface)
+
+# Full-deck Top Trumps: play round after round until one side holds every card
+class DeckScene(MenuScene):
+    def __init__(self, player_name):
+        super().__init__()
+        self.player_name = player_name
+        self.game = None
+        self.last_round = ""
+        self.back_button = Button("Main Menu", 560, 520, 200, 50, lambda: self.stack.pop())
+
+    def enter(self):
+        self.game = DeckGame(load_records(range(1, MAX_POKEMON_ID + 1)), difficulty, rng=deck_rng)
+        session.record_deck(len(self.game.cards), difficulty)
+        self.refresh_buttons()
+
+    def refresh_buttons(self):
+        game = self.game
+        if game.finished:
+            self.buttons = [self.back_button]
+        elif game.turn == PLAYER:
+            card = game.top_cards()[0]
+            self.buttons = [
+                Button(f"{stat.title()}: {value}", 420, 90 + i * 55, 340, 45, lambda stat=stat: self.play(stat))
+                for i, (stat, value) in enumerate(card.stats.items())
+            ] + [self.back_button]
+        else:
+            self.buttons = [Button("CPU plays", 420, 200, 200, 50, self.play), self.back_button]
+
+    def play(self, stat=None):
+        result = self.game.play_round(stat)
+        session.record_deck_round(result.player_card.id, result.opponent_card.id, result.stat, result.outcome)
+        if result.outcome == WIN:
+            verdict = "you take the cards"
+            audio.play(WIN_SOUND)
+        elif result.outcome == LOSE:
+            verdict = "the CPU takes the cards"
+            audio.play(LOSE_SOUND)
+        else:
+            verdict = f"tie, {result.pot} cards in the pot"
+        self.last_round = (f"{result.player_card.name.capitalize()} vs {result.opponent_card.name.capitalize()} "
+                           f"on {result.stat}: {verdict}")
+        if self.game.finished and self.game.winner == PLAYER:
+            update_high_scores(self.player_name, 1)
+        self.refresh_buttons()
+
+    def draw(self, surface):
+        super().draw(surface)
+        game = self.game
+        draw_text(f"You: {len(game.player)}   CPU: {len(game.opponent)}   Pot: {len(game.pot)}", 40, 20)
+        draw_text(self.last_round, 40, 470, small_font)
+        if game.finished:
+            message = {PLAYER: "You won the whole deck!", OPPONENT: "The CPU won the deck!"}.get(
+                game.winner, "Stalemate!")
+            draw_text(message, 260, 250)
+            return
+        card = game.top_cards()[0]
+        img = load_image(card.sprite)
+        if img:
+            surface.blit(img, (120, 110))
+        draw_text(card.name.capitalize(), 120, 270)
+        if game.turn != PLAYER:
+            draw_text("The CPU chooses this round", 420, 140, small_font)
 
-    # Flash screen
-    for _ in range(2):
-        screen.fill((0, 255, 0) if "Win" in result else (255, 0, 0))
-        pygame.display.update()
-        pygame.time.delay(150)
-        screen.fill(background_color)
-        pygame.display.update()
-        pygame.time.delay(150)
-
-    show_result_screen(result)
-
-def show_result_screen(result):
-    running = True
-    while running:
-        screen.fill(background_color)
-        draw_text(result, 330, 200)
-        button("Play Again", 300, 300, 200, 50, start_game)
-        button("Main Menu", 300, 370, 200, 50, main_menu)
-
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                pygame.quit()
+def quit_game():
+    game.clear()
 
-        pygame.display.update()
-        clock.tick(60)
+# === START GAME ===
+game = SceneStack()
 
-def quit_game():
+def main():
+    init_game()
+    game.push(MainMenuScene())
+    game.run(screen, clock, 60, scheduler)
     pygame.quit()
-    exit()
 
-# === START GAME ===
-main_menu()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from rules import MAX_POKEMON_ID
+
+# === Round Prefetcher ===
+# Draws Pokémon ids for the next round ahead of time and warms them (data +
+# sprite) on a thread pool, so by the time a screen needs them they are already
+# in the local caches.  `warm` is whatever the entry point uses to fetch a
+# Pokémon and its sprite; its return value is ignored.  With `warm_batch`
+# (e.g. pokemon_cache.get_pokemon_batch) a round's data is fetched in one
+# request first and the per-id warm-ups only have sprites left to do.
+# Front ends whose opponent is picked by the AI (stat_index) pass
+# opponents=False so no random opponents are warmed for nothing.
+class RoundPrefetcher:
+    def __init__(self, warm, choices=3, max_id=MAX_POKEMON_ID, workers=4, rng=None, warm_batch=None,
+                 opponents=True):
+        self.warm = warm
+        self.warm_batch = warm_batch
+        self.opponents = opponents
+        self.choices = choices
+        self.max_id = max_id
+        self.rng = rng or random.Random()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._next_choices = None
+        self._next_opponent = None
+
+    def _draw_id(self):
+        return self.rng.randint(1, self.max_id)
+
+    def _schedule(self, ids):
+        # The batch job is queued first, so the warm-ups waiting on it can't starve it
+        batch = None
+        if self.warm_batch is not None and len(ids) > 1:
+            batch = self._pool.submit(self._warm_batch_quietly, ids)
+        return [(pokemon_id, self._pool.submit(self._warm_quietly, pokemon_id, batch)) for pokemon_id in ids]
+
+    def _warm_batch_quietly(self, ids):
+        try:
+            self.warm_batch(ids)
+        except Exception as e:
+            print(f"Batch prefetch of {len(ids)} Pokémon failed: {e}")
+
+    def _warm_quietly(self, pokemon_id, batch=None):
+        # A failed warm-up is not fatal: the caller just fetches it again in the foreground
+        try:
+            if batch is not None:
+                batch.result()
+            self.warm(pokemon_id)
+        except Exception as e:
+            print(f"Prefetch of Pokémon {pokemon_id} failed: {e}")
+
+    @staticmethod
+    def _wait(scheduled):
+        pokemon_id, future = scheduled
+        future.result()
+        return pokemon_id
+
+    def next_choices(self):
+        with self._lock:
+            pending = self._next_choices
+            if pending is None:
+                pending = self._schedule([self._draw_id() for _ in range(self.choices)])
+            self._next_choices = None
+        ids = [self._wait(scheduled) for scheduled in pending]
+        # While the player makes up their mind, get the opponent and next round ready
+        self.prefetch_round()
+        return ids
+
+    def next_opponent(self):
+        with self._lock:
+            pending = self._next_opponent
+            if pending is None:
+                pending = self._schedule([self._draw_id()])[0]
+            self._next_opponent = None
+        pokemon_id = self._wait(pending)
+        self.prefetch_round()
+        return pokemon_id
+
+    # Warm one Pokémon drawn elsewhere (the AI's opponent, once the stat is
+    # known); the future is done when it is in the local caches
+    def warm_one(self, pokemon_id):
+        return self._pool.submit(self._warm_quietly, pokemon_id)
+
+    def prefetch_round(self):
+        with self._lock:
+            need_opponent = self.opponents and self._next_opponent is None
+            need_choices = self._next_choices is None
+            ids = [self._draw_id() for _ in range(need_opponent + self.choices * need_choices)]
+            if not ids:
+                return
+            scheduled = self._schedule(ids)
+            if need_opponent:
+                self._next_opponent = scheduled.pop(0)
+            if need_choices:
+                self._next_choices = scheduled
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
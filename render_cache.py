@@ -0,0 +1,113 @@
+from collections import OrderedDict
+
+import pygame
+
+
+# === Surface Cache ===
+# Small LRU of pre-rendered surfaces.  `build` is only called on a miss.
+class SurfaceCache:
+    def __init__(self, max_items=512):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def get(self, key, build):
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = build()
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_items:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+text_cache = SurfaceCache(max_items=1024)
+shape_cache = SurfaceCache(max_items=256)
+
+
+def text_surface(text, font, color):
+    return text_cache.get((text, font, color), lambda: font.render(text, True, color))
+
+
+def solid_surface(size, color):
+    def build():
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return surface
+    return shape_cache.get((size, color), build)
+
+
+# === Retained-Mode Renderer ===
+# Each frame the screen code submits what should be on screen with blit(), then
+# calls present().  Only the areas that differ from the previous frame are
+# repainted and pushed with pygame.display.update(rects), so a screen that
+# hasn't changed costs a list comparison and no drawing at all.  Surfaces are
+# compared by identity, which is why the text and shapes above are cached.
+class Renderer:
+    def __init__(self, screen, background=None, fill_color=(0, 0, 0)):
+        self.screen = screen
+        self.background = background
+        self.fill_color = fill_color
+        self.frames = 0
+        self.skipped_frames = 0
+        self._shown = []
+        self._pending = []
+        self._full_redraw = True
+
+    def blit(self, surface, pos):
+        self._pending.append((surface, (int(pos[0]), int(pos[1]))))
+
+    def set_background(self, background):
+        self.background = background
+        self._full_redraw = True
+
+    def invalidate(self):
+        self._full_redraw = True
+
+    def _restore(self, rect):
+        if self.background is not None:
+            self.screen.blit(self.background, rect, rect)
+        else:
+            self.screen.fill(self.fill_color, rect)
+
+    def present(self):
+        items = self._pending
+        self._pending = []
+        self.frames += 1
+
+        if self._full_redraw:
+            self._restore(self.screen.get_rect())
+            for surface, pos in items:
+                self.screen.blit(surface, pos)
+            pygame.display.flip()
+            self._full_redraw = False
+            self._shown = items
+            return [self.screen.get_rect()]
+
+        if items == self._shown:
+            self.skipped_frames += 1
+            return []
+
+        shown = set(self._shown)
+        wanted = set(items)
+        dirty = [pygame.Rect(pos, surface.get_size()) for surface, pos in shown.symmetric_difference(wanted)]
+        # Repaint each dirty area from the background up, clipped so items that
+        # only partly overlap it aren't blended over themselves a second time.
+        for rect in dirty:
+            self.screen.set_clip(rect)
+            self._restore(rect)
+            for surface, pos in items:
+                if rect.colliderect(pygame.Rect(pos, surface.get_size())):
+                    self.screen.blit(surface, pos)
+        self.screen.set_clip(None)
+        pygame.display.update(dirty)
+        self._shown = items
+        return dirty
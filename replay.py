@@ -0,0 +1,320 @@
+import argparse
+import atexit
+import hashlib
+import os
+import random
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from deck_game import PLAYER, DeckGame
+from pokemon_record import load_records
+from prefetch import RoundPrefetcher
+from rules import DIFFICULTY_LEVELS, LOSE, MAX_POKEMON_ID, STAT_NAMES, TIE, WIN, battle_outcome
+from stat_index import StatIndex, complete_stat_index
+
+# === Settings ===
+# SHOWDOWN_SEED fixes the session seed; SHOWDOWN_REPLAY is the log to append
+# to (set it empty to turn recording off)
+SEED = os.environ.get("SHOWDOWN_SEED")
+REPLAY_PATH = os.environ.get("SHOWDOWN_REPLAY", "replay.bin")
+
+# === Binary Format ===
+# A file header, then fixed-size little-endian events appended back to back.
+# A session's events follow its SESSION event; several sessions share a file.
+# Event kinds are only ever added, so old logs stay readable as they are.
+MAGIC = b"PKRP"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sB")
+CHOICES_PER_ROUND = 3
+SESSION, CHOICES, ROUND, DECK, DECK_ROUND = 1, 2, 3, 4, 5
+EVENTS = {
+    # seed, max id, start time (unix seconds)
+    SESSION: struct.Struct("<BQHd"),
+    # the ids offered to the player
+    CHOICES: struct.Struct("<B" + "H" * CHOICES_PER_ROUND),
+    # player id, opponent id, stat, difficulty, flags, outcome, player value, opponent value
+    ROUND: struct.Struct("<BHHBBBbHH"),
+    # a deck game was dealt: number of cards, difficulty
+    DECK: struct.Struct("<BHB"),
+    # one deck round: player card id, opponent card id, stat, outcome
+    DECK_ROUND: struct.Struct("<BHHBb"),
+}
+
+# Stats are stored as an index: the base stats, then the extra fields main.py accepts
+STATS = STAT_NAMES + ("id", "height", "weight")
+UNKNOWN_STAT = 255
+OUTCOME_CODES = {WIN: 1, TIE: 0, LOSE: -1}
+OUTCOMES = {code: outcome for outcome, code in OUTCOME_CODES.items()}
+# ROUND flags: the opponent's value was difficulty-adjusted (main.py compares
+# raw stats); the opponent was a uniform draw because the stat index was not
+# complete yet
+ADJUSTED = 1
+UNIFORM_PICK = 2
+
+SessionStart = namedtuple("SessionStart", "seed max_id started_at")
+Choices = namedtuple("Choices", "ids")
+DeckDeal = namedtuple("DeckDeal", "cards level")
+DeckRound = namedtuple("DeckRound", "player_id opponent_id stat outcome")
+Round = namedtuple("Round", "player_id opponent_id stat level adjusted uniform_pick outcome player_value opponent_value")
+
+
+# SHOWDOWN_SEED may be any text: integers are taken modulo 2**64 (the log
+# stores seeds as unsigned 64-bit), anything else is hashed down to 64 bits
+def parse_seed(value):
+    try:
+        return int(value) % 2**64
+    except ValueError:
+        return int.from_bytes(hashlib.sha256(str(value).encode("utf-8")).digest()[:8], "little")
+
+
+# === Session ===
+# One seed per run.  Each consumer gets its own named RNG stream derived from
+# it, so the choice draws and the AI's opponent picks stay reproducible even
+# though they happen on different threads.
+class Session:
+    def __init__(self, seed=None, log_path=REPLAY_PATH, max_id=MAX_POKEMON_ID):
+        self.seed = parse_seed(seed) if seed is not None else random.SystemRandom().getrandbits(63)
+        self.max_id = max_id
+        self.log_path = log_path
+        self._log = None
+        self._lock = threading.Lock()
+
+    def rng_for(self, name):
+        return random.Random(f"{self.seed}:{name}")
+
+    def _write(self, kind, *fields):
+        if not self.log_path:
+            return
+        with self._lock:
+            if self._log is None:
+                self._open()
+            self._log.write(EVENTS[kind].pack(kind, *fields))
+
+    def _open(self):
+        self._log = open(self.log_path, "ab", buffering=64 * 1024)
+        if self._log.tell() == 0:
+            self._log.write(HEADER.pack(MAGIC, FORMAT_VERSION))
+        self._log.write(EVENTS[SESSION].pack(SESSION, self.seed, self.max_id, time.time()))
+        atexit.register(self.close)
+
+    def record_choices(self, ids):
+        self._write(CHOICES, *ids)
+
+    def record_round(self, player_id, opponent_id, stat, level, outcome, player_value, opponent_value,
+                     adjusted=True, uniform_pick=False):
+        self._write(
+            ROUND,
+            player_id,
+            opponent_id,
+            STATS.index(stat) if stat in STATS else UNKNOWN_STAT,
+            DIFFICULTY_LEVELS.index(level) if level in DIFFICULTY_LEVELS else 1,
+            (ADJUSTED if adjusted else 0) | (UNIFORM_PICK if uniform_pick else 0),
+            OUTCOME_CODES[outcome],
+            min(int(player_value), 0xFFFF),
+            min(int(opponent_value), 0xFFFF),
+        )
+
+    def record_deck(self, cards, level):
+        self._write(DECK, cards, DIFFICULTY_LEVELS.index(level) if level in DIFFICULTY_LEVELS else 1)
+
+    def record_deck_round(self, player_id, opponent_id, stat, outcome):
+        self._write(DECK_ROUND, player_id, opponent_id, STATS.index(stat), OUTCOME_CODES[outcome])
+
+    def close(self):
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+# === Front End Setup ===
+# The session every front end in this process records into, and the streams
+# its rounds are drawn from: choices (through the prefetcher), the AI's
+# opponents and the deck shuffle.  Drawing them from the session seed is what
+# lets replay_session re-run a recorded game.
+session = Session(SEED)
+opponent_rng = session.rng_for("opponent")
+deck_rng = session.rng_for("deck")
+
+
+# The AI picks opponents from the stat index, so none are prefetched
+def round_prefetcher(warm, warm_batch=None):
+    return RoundPrefetcher(warm, rng=session.rng_for("choices"), warm_batch=warm_batch, opponents=False)
+
+
+# The AI's opponent for a round: (opponent id, uniform_pick).  Until the stat
+# index holds the whole dex the draw is uniform; pass uniform_pick on to
+# record_round so the replay draws the same way.
+def pick_opponent(level, stat=None):
+    index = complete_stat_index()
+    if index is None:
+        return opponent_rng.randint(1, session.max_id), True
+    return index.pick_opponent(level, stat, opponent_rng), False
+
+
+# === Reading ===
+def read_events(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a version {FORMAT_VERSION} replay log")
+    offset = HEADER.size
+    while offset < len(data):
+        kind = data[offset]
+        layout = EVENTS.get(kind)
+        if layout is None or offset + layout.size > len(data):
+            # A torn write at the end of the file (crash mid-event) is ignored
+            break
+        fields = layout.unpack_from(data, offset)[1:]
+        offset += layout.size
+        if kind == SESSION:
+            yield SessionStart(*fields)
+        elif kind == CHOICES:
+            yield Choices(fields)
+        elif kind == DECK:
+            cards, level = fields
+            yield DeckDeal(cards, DIFFICULTY_LEVELS[level])
+        elif kind == DECK_ROUND:
+            player_id, opponent_id, stat, outcome = fields
+            yield DeckRound(player_id, opponent_id, STATS[stat], OUTCOMES[outcome])
+        else:
+            player_id, opponent_id, stat, level, flags, outcome, player_value, opponent_value = fields
+            yield Round(
+                player_id,
+                opponent_id,
+                STATS[stat] if stat < len(STATS) else None,
+                DIFFICULTY_LEVELS[level],
+                bool(flags & ADJUSTED),
+                bool(flags & UNIFORM_PICK),
+                OUTCOMES[outcome],
+                player_value,
+                opponent_value,
+            )
+
+
+def read_sessions(path):
+    sessions = []
+    for event in read_events(path):
+        if isinstance(event, SessionStart):
+            sessions.append((event, []))
+        elif sessions:
+            sessions[-1][1].append(event)
+    return sessions
+
+
+# === Headless Replay ===
+# Re-draws every round from the session seed exactly as the front ends do
+# (choices from the prefetcher's stream, the opponent from the full stat index
+# or, where the log says the index wasn't complete yet, uniformly) and
+# re-resolves it against the current data and rules.  Deck games are dealt
+# again from the deck stream and played with the logged stats on the player's
+# turns and the CPU's strategy on its own.  Any difference from the log is
+# reported, which makes a log both a regression test and a benchmark.
+
+
+# Like the front ends' `stats.get(stat, 0)`: anything but a base stat counts as 0
+def stat_value(pokemon, stat, level=None):
+    if stat not in STAT_NAMES:
+        return 0
+    values = pokemon.adjusted_values(level) if level else pokemon.stat_values
+    return values[STAT_NAMES.index(stat)]
+
+
+def replay_session(start, events, records, index):
+    choices_rng = random.Random(f"{start.seed}:choices")
+    opponent_rng = random.Random(f"{start.seed}:opponent")
+    deck_rng = random.Random(f"{start.seed}:deck")
+    deck = None
+    mismatches = []
+    rounds = 0
+    for number, event in enumerate(events):
+        if isinstance(event, Choices):
+            drawn = tuple(choices_rng.randint(1, start.max_id) for _ in event.ids)
+            if drawn != event.ids:
+                mismatches.append((number, "choices", event.ids, drawn))
+            continue
+
+        if isinstance(event, DeckDeal):
+            # Same cards in the same order as the front end's load_records(1..max id)
+            cards = [records[pokemon_id] for pokemon_id in sorted(records) if pokemon_id <= start.max_id]
+            if len(cards) != event.cards:
+                mismatches.append((number, "deck size", event.cards, len(cards)))
+            deck = DeckGame(cards, event.level, rng=deck_rng)
+            continue
+
+        if isinstance(event, DeckRound):
+            rounds += 1
+            if deck is None or deck.finished:
+                mismatches.append((number, "deck round", tuple(event), "no game in progress"))
+                continue
+            result = deck.play_round(event.stat if deck.turn == PLAYER else None)
+            replayed = (result.player_card.id, result.opponent_card.id, result.stat, result.outcome)
+            if replayed != tuple(event):
+                mismatches.append((number, "deck round", tuple(event), replayed))
+            continue
+
+        rounds += 1
+        if event.uniform_pick:
+            opponent_id = opponent_rng.randint(1, start.max_id)
+        else:
+            opponent_id = index.pick_opponent(event.level, event.stat, opponent_rng)
+        if opponent_id != event.opponent_id:
+            mismatches.append((number, "opponent", event.opponent_id, opponent_id))
+        player = records.get(event.player_id)
+        opponent = records.get(event.opponent_id)
+        if player is None or opponent is None:
+            mismatches.append((number, "missing data", event.player_id, event.opponent_id))
+            continue
+        player_value = stat_value(player, event.stat)
+        opponent_value = stat_value(opponent, event.stat, event.level if event.adjusted else None)
+        outcome = battle_outcome(player_value, opponent_value)
+        if outcome != event.outcome:
+            mismatches.append((number, "outcome", event.outcome, outcome))
+    return rounds, mismatches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-run recorded sessions headless and check them")
+    parser.add_argument("log", nargs="?", default=REPLAY_PATH)
+    parser.add_argument("--repeat", type=int, default=1, help="replay everything N times (benchmarking)")
+    parser.add_argument("--verbose", action="store_true", help="list every mismatch")
+    args = parser.parse_args(argv)
+
+    sessions = read_sessions(args.log)
+    max_id = max([start.max_id for start, _ in sessions] + [1])
+    records = {r.id: r for r in load_records(range(1, max_id + 1))}
+    # The index must cover the same dex the sessions drew from
+    indexes = {}
+
+    start_time = time.perf_counter()
+    total_rounds = 0
+    failed = 0
+    for _ in range(args.repeat):
+        for start, events in sessions:
+            index = indexes.get(start.max_id)
+            if index is None:
+                index = indexes[start.max_id] = StatIndex(r for r in records.values() if r.id <= start.max_id)
+                if len(index) < start.max_id:
+                    print(f"Only {len(index)} of {start.max_id} Pokémon are cached; "
+                          f"opponents picked by the AI will not replay")
+            rounds, mismatches = replay_session(start, events, records, index)
+            total_rounds += rounds
+            if mismatches:
+                failed += 1
+                if args.verbose:
+                    for mismatch in mismatches:
+                        print(f"  seed {start.seed}: event {mismatch[0]} {mismatch[1]}: "
+                              f"logged {mismatch[2]}, replayed {mismatch[3]}")
+    elapsed = time.perf_counter() - start_time
+
+    print(f"{len(sessions)} sessions x {args.repeat}: {total_rounds} rounds in {elapsed:.3f}s "
+          f"({total_rounds / elapsed if elapsed else 0:,.0f} rounds/s)")
+    print(f"{failed} session replays diverged" if failed else "Every session replayed identically")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,36 @@
+import os
+
+# === Battle Rules ===
+# The rules every front end (and the headless tools) resolve battles with.
+
+# Pokémon are drawn from ids 1..MAX_POKEMON_ID.  The original 151 by default;
+# raise it when playing from a full-dex local dataset or mirror.
+MAX_POKEMON_ID = int(os.environ.get("POKEDEX_MAX_ID", "151"))
+
+DIFFICULTY_LEVELS = ["easy", "medium", "hard"]
+DIFFICULTY_MULTIPLIERS = {"easy": 0.8, "medium": 1.0, "hard": 1.2}
+
+# PokeAPI's base stats, in the order it returns them
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+WIN = "win"
+LOSE = "lose"
+TIE = "tie"
+
+
+def difficulty_multiplier(level):
+    return DIFFICULTY_MULTIPLIERS.get(level, 1.0)
+
+
+# Opponent stats are scaled by the difficulty multiplier and truncated to ints
+def apply_difficulty(stats, level):
+    multiplier = difficulty_multiplier(level)
+    return {k: int(v * multiplier) for k, v in stats.items()}
+
+
+def battle_outcome(player_value, opponent_value):
+    if player_value > opponent_value:
+        return WIN
+    if player_value < opponent_value:
+        return LOSE
+    return TIE
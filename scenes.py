@@ -0,0 +1,125 @@
+import math
+
+import pygame
+
+# While idle the loop still wakes this often, for anything that doesn't post an event
+IDLE_WAKE_MS = 1000
+
+
+# === Idle Waiting ===
+# Whole milliseconds the loop may sleep (pygame.event.wait takes an int): until
+# the scheduler's next timer, rounded up so it has fired on waking, capped at
+# IDLE_WAKE_MS (0 while a tween is running)
+def idle_timeout(scheduler=None):
+    wait = scheduler.time_until_next() if scheduler is not None else None
+    return IDLE_WAKE_MS if wait is None else math.ceil(min(wait, IDLE_WAKE_MS))
+
+
+# Block until input arrives or timeout_ms passes, then return everything queued
+def wait_events(timeout_ms=IDLE_WAKE_MS):
+    if timeout_ms <= 0:
+        return pygame.event.get()
+    event = pygame.event.wait(timeout_ms)
+    events = [] if event.type == pygame.NOEVENT else [event]
+    return events + pygame.event.get()
+
+
+# === Scene ===
+# One screen of the game.  Scenes never run their own loop: the SceneStack
+# calls these hooks once per frame for whichever scene is on top.  A scene
+# that changes without input or scheduler timers (not driven by a tween) sets
+# `animating` while it needs frames at the fixed rate.
+class Scene:
+    stack = None
+    animating = False
+
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def handle_event(self, event):
+        pass
+
+    def update(self):
+        pass
+
+    def draw(self, surface):
+        pass
+
+
+# === Scene Stack ===
+# Navigation is push/pop/replace on an explicit stack instead of one screen's
+# loop calling the next one, so the Python stack stays flat however long a
+# session runs.  Transitions requested mid-frame are applied before the next
+# frame starts, so a button handler can safely swap out its own scene.
+class SceneStack:
+    def __init__(self):
+        self._scenes = []
+        self._pending = []
+
+    @property
+    def top(self):
+        return self._scenes[-1] if self._scenes else None
+
+    def __len__(self):
+        return len(self._scenes)
+
+    def push(self, scene):
+        self._pending.append(("push", scene))
+
+    def pop(self):
+        self._pending.append(("pop", None))
+
+    def replace(self, scene):
+        self._pending.append(("replace", scene))
+
+    def clear(self):
+        self._pending.append(("clear", None))
+
+    def apply_pending(self):
+        while self._pending:
+            action, scene = self._pending.pop(0)
+            if action in ("pop", "replace") and self._scenes:
+                self._scenes.pop().exit()
+            elif action == "clear":
+                while self._scenes:
+                    self._scenes.pop().exit()
+            if action in ("push", "replace"):
+                scene.stack = self
+                self._scenes.append(scene)
+                scene.enter()
+
+    # The one and only game loop; returns once the stack is empty.  With `idle`
+    # the loop ticks at `fps` only while something animates; a static scene is
+    # drawn once and the loop then sleeps until input or the next timer.
+    def run(self, surface, clock, fps=60, scheduler=None, idle=True):
+        self.apply_pending()
+        ticking = True
+        while self._scenes:
+            scene = self.top
+            events = pygame.event.get() if ticking else wait_events(idle_timeout(scheduler))
+            for event in events:
+                if event.type == pygame.QUIT:
+                    self.clear()
+                    break
+                scene.handle_event(event)
+
+            if scheduler is not None:
+                scheduler.update()
+            scene.update()
+            self.apply_pending()
+
+            if self._scenes:
+                self.top.draw(surface)
+                pygame.display.update()
+
+            ticking = (
+                not idle
+                or bool(self._pending)
+                or (self.top is not None and self.top.animating)
+                or (scheduler is not None and scheduler.time_until_next() == 0)
+            )
+            if ticking:
+                clock.tick(fps)
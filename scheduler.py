@@ -0,0 +1,138 @@
+import heapq
+import itertools
+import time
+
+
+def monotonic_ms():
+    return time.monotonic() * 1000
+
+
+# === Timer ===
+class Timer:
+    __slots__ = ("at", "callback", "done", "cancelled")
+
+    def __init__(self, at, callback):
+        self.at = at
+        self.callback = callback
+        self.done = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+# === Tween ===
+# Calls on_update(progress) once per frame with progress going 0.0 -> 1.0 over
+# `duration` ms, then on_done().
+class Tween:
+    __slots__ = ("start", "duration", "on_update", "on_done", "progress", "done", "cancelled")
+
+    def __init__(self, start, duration, on_update, on_done=None):
+        self.start = start
+        self.duration = duration
+        self.on_update = on_update
+        self.on_done = on_done
+        self.progress = 0.0
+        self.done = False
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+# === Scheduler ===
+# Frame-driven replacement for pygame.time.wait/delay: the game loop calls
+# update() once per frame and keeps pumping events in between, so timed
+# effects never block input.  Times are in milliseconds.
+class Scheduler:
+    def __init__(self, clock=monotonic_ms):
+        self.clock = clock
+        self._timers = []
+        self._tweens = []
+        self._order = itertools.count()
+
+    def now(self):
+        return self.clock()
+
+    def after(self, delay, callback=None):
+        timer = Timer(self.now() + delay, callback)
+        heapq.heappush(self._timers, (timer.at, next(self._order), timer))
+        return timer
+
+    # Run (delay, callback) steps one after another; returns the last step's timer
+    def sequence(self, steps):
+        at = 0
+        timer = None
+        for delay, callback in steps:
+            at += delay
+            timer = self.after(at, callback)
+        return timer
+
+    def tween(self, duration, on_update, on_done=None):
+        tween = Tween(self.now(), duration, on_update, on_done)
+        self._tweens.append(tween)
+        return tween
+
+    def update(self):
+        now = self.now()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, timer = heapq.heappop(self._timers)
+            if timer.cancelled:
+                continue
+            timer.done = True
+            if timer.callback:
+                timer.callback()
+
+        if self._tweens:
+            # Tweens started from inside a callback land in the fresh list
+            tweens, self._tweens = self._tweens, []
+            active = []
+            for tween in tweens:
+                if tween.cancelled:
+                    continue
+                tween.progress = min(1.0, (now - tween.start) / tween.duration) if tween.duration else 1.0
+                tween.on_update(tween.progress)
+                if tween.progress >= 1.0:
+                    tween.done = True
+                    if tween.on_done:
+                        tween.on_done()
+                else:
+                    active.append(tween)
+            self._tweens = active + self._tweens
+
+    # True while anything is animating or waiting to fire
+    @property
+    def busy(self):
+        return bool(self._tweens) or any(not t.cancelled for _, _, t in self._timers)
+
+    # Milliseconds until the next timer fires (0 while a tween is running), or None
+    def time_until_next(self):
+        if self._tweens:
+            return 0
+        while self._timers and self._timers[0][2].cancelled:
+            heapq.heappop(self._timers)
+        if not self._timers:
+            return None
+        return max(0, self._timers[0][0] - self.now())
+
+    def cancel_all(self):
+        self._timers.clear()
+        self._tweens.clear()
+
+
+# === Flash ===
+# Screen flash as a tween: `on` toggles every `interval` ms, `times` times.
+class Flash:
+    def __init__(self, scheduler, color, times=3, interval=200, on_done=None):
+        self.color = color
+        self.times = times
+        self.on = True
+        self.tween = scheduler.tween(times * 2 * interval, self._update, on_done)
+
+    def _update(self, progress):
+        phase = min(int(progress * self.times * 2), self.times * 2 - 1)
+        self.on = phase % 2 == 0
+
+    @property
+    def active(self):
+        return not self.tween.done and not self.tween.cancelled
@@ -0,0 +1,147 @@
+import argparse
+import json
+import mmap
+import os
+import threading
+from io import BytesIO
+
+import pygame
+
+# === Sprite Atlas ===
+# Every sprite, pre-scaled to each size the front ends draw, packed into one
+# raw RGBA pixel file plus a JSON index of where each one sits:
+#
+#   sprite_atlas.json  {"version", "data", "width", "height", "format",
+#                       "sprites": {url: {"150x150": [x, y, w, h], ...}}}
+#   sprite_atlas.rgba  width * height * 4 bytes, row-major
+#
+# At runtime the pixel file is memory-mapped and wrapped in a single Surface
+# without copying it; each sprite is a subsurface of that, created once.  Drawing
+# a Pokémon then needs no download, no PNG decode and no scaling.
+ATLAS_PATH = os.environ.get("SPRITE_ATLAS", "sprite_atlas.json")
+ATLAS_VERSION = 1
+ATLAS_FORMAT = "RGBA"
+# The sizes load_pokemon_image / load_image ask for
+DEFAULT_SIZES = ((150, 150), (200, 200))
+COLUMNS = 16
+
+
+def size_key(size):
+    return f"{size[0]}x{size[1]}"
+
+
+class SpriteAtlas:
+    def __init__(self, index_path=ATLAS_PATH):
+        with open(index_path, "r") as f:
+            index = json.load(f)
+        if index.get("version") != ATLAS_VERSION or index.get("format") != ATLAS_FORMAT:
+            raise ValueError(f"{index_path} is not a version {ATLAS_VERSION} {ATLAS_FORMAT} sprite atlas")
+        self.width = index["width"]
+        self.height = index["height"]
+        self.rects = index["sprites"]
+        data_path = os.path.join(os.path.dirname(index_path), index["data"])
+        with open(data_path, "rb") as f:
+            # Copy-on-write mapping: pages are read lazily from the file and never written back
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        self.surface = pygame.image.frombuffer(self._map, (self.width, self.height), ATLAS_FORMAT)
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, url):
+        return url in self.rects
+
+    def get(self, url, size):
+        key = (url, size)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+        rect = self.rects.get(url, {}).get(size_key(size))
+        if rect is None:
+            return None
+        with self._lock:
+            return self._views.setdefault(key, self.surface.subsurface(pygame.Rect(rect)))
+
+
+# None if there is no atlas (or it can't be read); callers fall back to single sprites
+def load_atlas(index_path=ATLAS_PATH):
+    if not os.path.exists(index_path):
+        return None
+    try:
+        return SpriteAtlas(index_path)
+    except (OSError, ValueError, KeyError, pygame.error) as e:
+        print(f"Ignoring sprite atlas {index_path}: {e}")
+        return None
+
+
+# === Build Step ===
+# Sprites come through the sprite cache, so anything already on disk is not
+# downloaded again.  Each size gets its own band of COLUMNS-wide rows.
+def build_atlas(urls, sizes=DEFAULT_SIZES, index_path=ATLAS_PATH, cache=None):
+    from sprite_cache import get_cache
+
+    cache = cache or get_cache()
+    images = {}
+    for url in urls:
+        try:
+            images[url] = pygame.image.load(BytesIO(cache.png_bytes(url)))
+        except Exception as e:
+            print(f"Skipping {url}: {e}")
+
+    urls = list(images)
+    rows = (len(urls) + COLUMNS - 1) // COLUMNS
+    width = COLUMNS * max(w for w, _ in sizes)
+    height = rows * sum(h for _, h in sizes)
+    atlas = pygame.Surface((width, max(1, height)), pygame.SRCALPHA)
+    rects = {url: {} for url in urls}
+
+    top = 0
+    for w, h in sizes:
+        for i, url in enumerate(urls):
+            x, y = (i % COLUMNS) * w, top + (i // COLUMNS) * h
+            atlas.blit(pygame.transform.scale(images[url], (w, h)), (x, y))
+            rects[url][size_key((w, h))] = [x, y, w, h]
+        top += rows * h
+
+    base, _ = os.path.splitext(index_path)
+    data_path = base + ".rgba"
+    # Pixels first, index last: a reader never sees an index pointing at missing data
+    with open(data_path + ".tmp", "wb") as f:
+        f.write(pygame.image.tostring(atlas, ATLAS_FORMAT))
+    os.replace(data_path + ".tmp", data_path)
+    index = {
+        "version": ATLAS_VERSION,
+        "data": os.path.basename(data_path),
+        "width": atlas.get_width(),
+        "height": atlas.get_height(),
+        "format": ATLAS_FORMAT,
+        "sprites": rects,
+    }
+    with open(index_path + ".tmp", "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(index_path + ".tmp", index_path)
+    return len(urls), atlas.get_width(), atlas.get_height()
+
+
+def parse_sizes(text):
+    return tuple((int(s), int(s)) for s in text.split(","))
+
+
+def main(argv=None):
+    from pokemon_cache import sprite_url
+    from rules import MAX_POKEMON_ID
+
+    parser = argparse.ArgumentParser(description="Pack every Pokémon sprite into one memory-mappable atlas")
+    parser.add_argument("--sizes", default=",".join(str(w) for w, _ in DEFAULT_SIZES),
+                        help="comma list of square sprite sizes in pixels")
+    parser.add_argument("--max-id", type=int, default=MAX_POKEMON_ID, help="pack Pokémon 1..MAX_ID")
+    parser.add_argument("--output", default=ATLAS_PATH, help="index path; pixels go next to it as .rgba")
+    args = parser.parse_args(argv)
+
+    count, width, height = build_atlas(
+        [sprite_url(i) for i in range(1, args.max_id + 1)], parse_sizes(args.sizes), args.output
+    )
+    print(f"Packed {count} sprites into a {width}x{height} atlas ({width * height * 4 / 2**20:.1f} MB) at {args.output}")
+
+
+if __name__ == "__main__":
+    main()
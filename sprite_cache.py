@@ -0,0 +1,167 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+import pygame
+import http_client
+from perf import incr, timer
+from sprite_atlas import load_atlas
+
+# === Cache Settings ===
+SPRITE_DIR = os.environ.get("SPRITE_CACHE_DIR", "sprite_cache")
+# Decoded surfaces are budgeted by pixel memory, not by count.  A 200x200 RGBA
+# sprite is ~160 KB, so the default keeps a few hundred of them around.
+MAX_MEMORY_BYTES = 48 * 1024 * 1024
+# Don't hammer the sprite host every frame when a download fails
+FAILURE_RETRY_SECONDS = 30
+
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+# === Sprite Cache ===
+# Two tiers: ready-to-blit surfaces keyed by (url, size) in an LRU bounded by
+# memory, and the raw PNG bytes on disk keyed by url so each sprite is only ever
+# downloaded once.  A prebuilt sprite atlas (sprite_atlas.py), when given, is
+# asked first; anything it doesn't hold goes through the tiers as usual.
+class SpriteCache:
+    def __init__(self, directory=SPRITE_DIR, max_bytes=MAX_MEMORY_BYTES, atlas=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.atlas = atlas
+        self.atlas_hits = 0
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.downloads = 0
+        self._surfaces = OrderedDict()
+        self._failed = {}
+        # Sprites are warmed from prefetch threads, so guard the LRU bookkeeping
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _disk_path(self, url):
+        return os.path.join(self.directory, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".png")
+
+    def _read_png(self, url):
+        path = self._disk_path(url)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                return f.read()
+
+        with timer("net.sprite"):
+            response = http_client.get(url)
+        response.raise_for_status()
+        self.downloads += 1
+        # Write to a temp file first so a crash never leaves a half-written PNG behind
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(response.content)
+        os.replace(tmp_path, path)
+        return response.content
+
+    # Raw PNG bytes for a sprite, from disk or downloaded once (the atlas build uses this)
+    def png_bytes(self, url):
+        return self._read_png(url)
+
+    def _decode(self, png_bytes, size):
+        with timer("sprite.decode"):
+            return self._decode_and_scale(png_bytes, size)
+
+    def _decode_and_scale(self, png_bytes, size):
+        image = pygame.image.load(BytesIO(png_bytes))
+        image = pygame.transform.scale(image, size)
+        # Match the display's pixel format once here instead of on every blit
+        if pygame.display.get_surface() is not None:
+            image = image.convert_alpha()
+        return image
+
+    def get(self, url, size):
+        if self.atlas is not None:
+            surface = self.atlas.get(url, size)
+            if surface is not None:
+                self.atlas_hits += 1
+                incr("sprite_cache.hit")
+                return surface
+
+        key = (url, size)
+        with self._lock:
+            surface = self._surfaces.get(key)
+            if surface is not None:
+                self._surfaces.move_to_end(key)
+                self.hits += 1
+                incr("sprite_cache.hit")
+                return surface
+
+            retry_at = self._failed.get(url)
+            if retry_at is not None and time.time() < retry_at:
+                return None
+
+            self.misses += 1
+            incr("sprite_cache.miss")
+
+        try:
+            surface = self._decode(self._read_png(url), size)
+        except Exception as e:
+            print(f"Failed to load sprite {url}: {e}")
+            with self._lock:
+                self._failed[url] = time.time() + FAILURE_RETRY_SECONDS
+            return None
+
+        with self._lock:
+            self._failed.pop(url, None)
+            if key not in self._surfaces:
+                self._surfaces[key] = surface
+                self.memory_bytes += surface_bytes(surface)
+                self._evict()
+            return self._surfaces[key]
+
+    def _evict(self):
+        # Always keep the most recent surface, even if it alone is over budget
+        while self.memory_bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, surface = self._surfaces.popitem(last=False)
+            self.memory_bytes -= surface_bytes(surface)
+
+    def clear_memory(self):
+        with self._lock:
+            self._surfaces.clear()
+            self.memory_bytes = 0
+
+    def clear_disk(self):
+        for name in os.listdir(self.directory):
+            if name.endswith(".png"):
+                os.remove(os.path.join(self.directory, name))
+
+    def stats(self):
+        lookups = self.hits + self.atlas_hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "atlas_hits": self.atlas_hits,
+            "downloads": self.downloads,
+            "hit_rate": (self.hits + self.atlas_hits) / lookups if lookups else 0.0,
+            "surfaces": len(self._surfaces),
+            "memory_bytes": self.memory_bytes,
+        }
+
+
+# === Shared Cache ===
+# First reached from prefetch workers as often as from the game loop
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SpriteCache(atlas=load_atlas())
+        return _cache
+
+
+def get_sprite(url, size):
+    return get_cache().get(url, size)
@@ -0,0 +1,165 @@
+import random
+import threading
+import time
+from bisect import bisect_left
+
+from pokemon_record import load_records
+from rules import MAX_POKEMON_ID, STAT_NAMES
+
+# === Stat Ranking Index ===
+# Built once from every Pokémon in play.  For each stat it keeps the dex's
+# ceiling (stat bars are scaled against it), every Pokémon's percentile and
+# the ids ordered weakest to strongest; "overall" ranks by mean percentile.
+# Everything a round asks for is then a lookup, never a scan of the dex.
+OVERALL = "overall"
+BUCKETS = 4
+# How likely the AI is to pick its opponent from each rank bucket, weakest first
+BUCKET_WEIGHTS = {
+    "easy": (4, 3, 2, 1),
+    "medium": (1, 1, 1, 1),
+    "hard": (1, 2, 3, 4),
+}
+# Stat bars are scaled against this until the index is ready (the highest base stat there is)
+FALLBACK_CEILING = 255
+# How long an index missing some of the dex is used before it is topped up
+RETRY_SECONDS = 30
+
+
+class StatIndex:
+    def __init__(self, records):
+        records = list(records)
+        count = len(records)
+        columns = [sorted(r.stat_values[i] for r in records) for i in range(len(STAT_NAMES))]
+
+        self.ceilings = {stat: (column[-1] if column else 0) for stat, column in zip(STAT_NAMES, columns)}
+        # Share of the rest of the dex each Pokémon beats outright on each stat
+        self.percentiles = {
+            r.id: tuple(bisect_left(column, r.stat_values[i]) / max(1, count - 1) for i, column in enumerate(columns))
+            for r in records
+        }
+        self.best = {}
+        for pokemon_id, percentiles in self.percentiles.items():
+            column = max(range(len(STAT_NAMES)), key=percentiles.__getitem__)
+            self.best[pokemon_id] = (STAT_NAMES[column], percentiles[column])
+
+        self.ranked = {
+            stat: [r.id for r in sorted(records, key=lambda r, i=i: r.stat_values[i])]
+            for i, stat in enumerate(STAT_NAMES)
+        }
+        self.ranked[OVERALL] = sorted(self.percentiles, key=lambda pokemon_id: sum(self.percentiles[pokemon_id]))
+        self.bounds = [(b * count // BUCKETS, (b + 1) * count // BUCKETS) for b in range(BUCKETS)]
+
+    def __len__(self):
+        return len(self.percentiles)
+
+    def percentile(self, pokemon_id, stat):
+        return self.percentiles[pokemon_id][STAT_NAMES.index(stat)]
+
+    # (stat name, percentile) of a Pokémon's strongest stat relative to the dex
+    def best_stat(self, pokemon_id):
+        return self.best.get(pokemon_id)
+
+    def hint(self, pokemon_id):
+        best = self.best.get(pokemon_id)
+        if best is None:
+            return ""
+        stat, percentile = best
+        return f"Hint: {stat} beats {percentile:.0%} of the dex"
+
+    def ceiling(self, stat):
+        return self.ceilings.get(stat) or 1
+
+    # The AI opponent: a random Pokémon from a rank bucket on the stat being
+    # played (or overall strength), with harder levels favouring stronger
+    # buckets.  With nothing indexed it is a uniform draw over the whole dex.
+    def pick_opponent(self, level, stat=None, rng=random):
+        ranked = self.ranked.get(stat) or self.ranked[OVERALL]
+        if not ranked:
+            return rng.randint(1, MAX_POKEMON_ID)
+        weights = BUCKET_WEIGHTS.get(level, BUCKET_WEIGHTS["medium"])
+        low, high = self.bounds[rng.choices(range(BUCKETS), weights)[0]]
+        if low == high:
+            return rng.choice(ranked)
+        return ranked[rng.randrange(low, high)]
+
+
+# The chance pick_opponent draws each rank position (weakest first) of a
+# ranking of `count` Pokémon; the numpy simulators sample opponents with it
+def rank_weights(count, level):
+    weights = BUCKET_WEIGHTS.get(level, BUCKET_WEIGHTS["medium"])
+    total = sum(weights)
+    probabilities = [0.0] * count
+    for bucket, weight in enumerate(weights):
+        low, high = bucket * count // BUCKETS, (bucket + 1) * count // BUCKETS
+        # An empty bucket falls back to the whole ranking, as in pick_opponent
+        if low == high:
+            low, high = 0, count
+        for position in range(low, high):
+            probabilities[position] += weight / total / (high - low)
+    return probabilities
+
+
+# === Shared Index ===
+# preload() builds it on a background thread at startup; get_stat_index()
+# waits for that build (or does it) the first time it is needed.  A build
+# that came up short (offline, or a partial fetch) is kept for RETRY_SECONDS
+# and then rebuilt, so one bad startup doesn't last for the whole process.
+_index = None
+_complete = False
+_retry_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _stale():
+    return _index is None or (not _complete and time.monotonic() >= _retry_at)
+
+
+def get_stat_index():
+    global _index, _complete, _retry_at
+    with _index_lock:
+        if _stale():
+            ids = range(1, MAX_POKEMON_ID + 1)
+            records = load_records(ids)
+            _index = StatIndex(records)
+            _complete = len(records) == len(ids)
+            _retry_at = time.monotonic() + RETRY_SECONDS
+        return _index
+
+
+# The index if it has one Pokémon or more in it, else None.  Never blocks: a
+# missing or incomplete index is (re)built on a background thread instead.
+def stat_index_if_ready():
+    if _stale() and not _index_lock.locked():
+        preload()
+    return _index or None
+
+
+# The index only once it holds the whole dex, else None (never blocks).  The
+# AI picks from nothing else, so a recorded game can be replayed against a
+# full index built later.
+def complete_stat_index():
+    index = stat_index_if_ready()
+    return index if _complete else None
+
+
+def preload():
+    threading.Thread(target=get_stat_index, name="stat-index", daemon=True).start()
+
+
+# === Front End Helpers ===
+# For render and event threads: each answers straight away, falling back to a
+# fixed ceiling and no hint until the index is ready.  The AI's opponent pick
+# lives in replay.pick_opponent, which also records how it was drawn.
+def stat_ceiling(stat):
+    index = stat_index_if_ready()
+    return index.ceiling(stat) if index else FALLBACK_CEILING
+
+
+def best_stat(pokemon_id):
+    index = stat_index_if_ready()
+    return index.best_stat(pokemon_id) if index else None
+
+
+def stat_hint(pokemon_id):
+    index = stat_index_if_ready()
+    return index.hint(pokemon_id) if index else ""
@@ -0,0 +1,148 @@
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+requests = pytest.importorskip("requests")
+
+import http_client  # noqa: E402
+from benchmarks.fake_pokeapi import FakePokeAPI  # noqa: E402
+from http_client import CircuitOpenError, HttpClient  # noqa: E402
+
+
+@pytest.fixture
+def api():
+    with FakePokeAPI(moves=1) as server:
+        yield server
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    # Record the backoff delays instead of sleeping them, with the jitter at its top
+    slept = []
+    monkeypatch.setattr(http_client.time, "sleep", slept.append)
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    return slept
+
+
+def pokemon_url(api, pokemon_id=1):
+    return f"{api.url}/api/v2/pokemon/{pokemon_id}/"
+
+
+@pytest.mark.parametrize("status", [500, 502, 503, 504, 429])
+def test_retries_retryable_statuses(api, sleeps, status):
+    client = HttpClient(max_retries=2)
+    api.fail(status, status)
+    response = client.get(pokemon_url(api))
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+    assert api.request_count == 3
+    assert client.retries == 2
+    assert not client.breaker(api.url).failures
+
+
+def test_other_errors_are_not_retried(api, sleeps):
+    client = HttpClient(max_retries=2)
+    api.fail(404)
+    assert client.get(pokemon_url(api)).status_code == 404
+    assert api.request_count == 1
+    assert sleeps == []
+
+
+def test_backoff_doubles_up_to_the_cap(api, sleeps):
+    client = HttpClient(max_retries=5, backoff=0.5)
+    api.fail(*[503] * 5)
+    assert client.get(pokemon_url(api)).status_code == 200
+    assert sleeps == [0.5, 1.0, 2.0, 4.0, http_client.MAX_BACKOFF_SECONDS]
+
+
+def test_gives_up_after_the_retry_budget(api, sleeps):
+    client = HttpClient(max_retries=2)
+    api.fail(500, 500, 500)
+    with pytest.raises(requests.exceptions.HTTPError) as error:
+        client.get(pokemon_url(api), stream=True)
+    assert error.value.response.status_code == 500
+    # The last response goes back to the pool too, not just the retried ones
+    assert error.value.response.raw.closed
+    assert api.request_count == 3
+    assert client.breaker(api.url).failures == 1
+
+
+def test_breaker_opens_after_repeated_failures(api, sleeps):
+    client = HttpClient(max_retries=0, failure_threshold=2)
+    api.fail(500, 500)
+    for _ in range(2):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.get(pokemon_url(api))
+    with pytest.raises(CircuitOpenError):
+        client.get(pokemon_url(api))
+    # Skipped without touching the network
+    assert api.request_count == 2
+    assert client.stats()["open_circuits"] == [urlsplit(api.url).netloc]
+
+
+def test_breaker_half_open_lets_one_probe_through(api):
+    client = HttpClient(max_retries=0, failure_threshold=1, reset_after=0.05)
+    api.fail(503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(pokemon_url(api))
+    breaker = client.breaker(api.url)
+    assert breaker.is_open
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    # Only the one probe: everyone else waits for it
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert client.get(pokemon_url(api)).status_code == 200
+    assert not breaker.is_open
+    assert breaker.failures == 0
+
+
+def test_failed_probe_reopens_the_breaker(api):
+    client = HttpClient(max_retries=0, failure_threshold=1, reset_after=0.05)
+    api.fail(503, 503)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(pokemon_url(api))
+    time.sleep(0.06)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.get(pokemon_url(api))
+    with pytest.raises(CircuitOpenError):
+        client.get(pokemon_url(api))
+    assert api.request_count == 2
+
+
+# The server's latency is a real sleep, so these leave time.sleep alone
+def test_read_timeout_is_retried_then_raised(api):
+    client = HttpClient(read_timeout=0.05, max_retries=1, backoff=0)
+    api.set_latency(0.3)
+    with pytest.raises(requests.exceptions.Timeout):
+        client.get(pokemon_url(api))
+    assert client.requests_sent == 2
+    assert client.retries == 1
+    assert client.breaker(api.url).failures == 1
+
+
+def test_timeout_then_success(api, monkeypatch):
+    client = HttpClient(read_timeout=0.05, max_retries=1)
+    api.set_latency(0.3)
+    # The server catches up during the backoff
+    monkeypatch.setattr(client, "_sleep_before_retry", lambda attempt: api.set_latency(0.0))
+    assert client.get(pokemon_url(api)).status_code == 200
+    assert client.requests_sent == 2
+    assert client.retries == 1
+
+
+def test_connection_refused_is_retried(sleeps):
+    with FakePokeAPI() as server:
+        url = f"{server.url}/api/v2/pokemon/1/"
+    client = HttpClient(max_retries=2)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get(url)
+    assert client.requests_sent == 3
+    assert len(sleeps) == 2
@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pokeapi_projection import POKEMON_FIELDS, ProjectionError, project_chunks  # noqa: E402
+
+# Shaped like a real /api/v2/pokemon/<id> body: keys in PokeAPI's alphabetical
+# order, unwanted scalars and containers between the wanted fields, and the
+# last wanted field ("weight") ending the body with no delimiter after it
+POKEMON = {
+    "abilities": [{"ability": {"name": "overgrow", "url": "https://pokeapi.co/api/v2/ability/65/"},
+                   "is_hidden": False, "slot": 1}],
+    "base_experience": 64,
+    "cries": {"latest": "https://x/1.ogg", "legacy": None},
+    "forms": [{"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon-form/1/"}],
+    "game_indices": [{"game_index": 153, "version": {"name": "red"}}],
+    "height": 7,
+    "held_items": [],
+    "id": 1,
+    "is_default": True,
+    "location_area_encounters": "https://pokeapi.co/api/v2/pokemon/1/encounters",
+    "moves": [{"move": {"name": "razor-wind", "url": "https://pokeapi.co/api/v2/move/13/"},
+               "version_group_details": [{"level_learned_at": 0, "note": "say \"hi\" {[\\"}]}],
+    "name": "bulbasaur",
+    "order": 1,
+    "past_types": [],
+    "species": {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon-species/1/"},
+    "sprites": {"front_default": "https://x/1.png", "other": {"home": {"front_female": None}}},
+    "stats": [{"base_stat": 45, "effort": 0, "stat": {"name": "hp", "url": ""}},
+              {"base_stat": 49, "effort": 0, "stat": {"name": "attack", "url": ""}}],
+    "types": [{"slot": 1, "type": {"name": "grass", "url": ""}}],
+    "weight": 69,
+}
+EXPECTED = {field: POKEMON[field] for field in POKEMON_FIELDS}
+
+
+BODIES = {
+    "compact": json.dumps(POKEMON).encode("utf-8"),
+    "indented": json.dumps(POKEMON, indent=2).encode("utf-8"),
+    "utf-8": json.dumps(dict(POKEMON, name="nidoran♀"), ensure_ascii=False).encode("utf-8"),
+}
+
+
+@pytest.mark.parametrize("body", list(BODIES.values()), ids=list(BODIES))
+def test_every_two_way_split(body):
+    expected = json.loads(body)
+    for split in range(len(body) + 1):
+        result = project_chunks([body[:split], body[split:]], POKEMON_FIELDS)
+        assert result == {field: expected[field] for field in POKEMON_FIELDS}, split
+
+
+@pytest.mark.parametrize("body", list(BODIES.values()), ids=list(BODIES))
+def test_every_fixed_chunk_size(body):
+    expected = json.loads(body)
+    for size in range(1, 65):
+        chunks = [body[i:i + size] for i in range(0, len(body), size)]
+        result = project_chunks(chunks, POKEMON_FIELDS)
+        assert result == {field: expected[field] for field in POKEMON_FIELDS}, size
+
+
+def test_stops_once_every_field_is_seen():
+    body = json.dumps(EXPECTED).encode("utf-8") + b"garbage that is never read"
+    assert project_chunks([body], POKEMON_FIELDS) == EXPECTED
+
+
+def test_rejects_non_objects():
+    with pytest.raises(ProjectionError):
+        project_chunks([b"[1, 2]"], POKEMON_FIELDS)
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pygame = pytest.importorskip("pygame")
+
+from scenes import IDLE_WAKE_MS, idle_timeout, wait_events  # noqa: E402
+from scheduler import Scheduler  # noqa: E402
+
+
+@pytest.fixture
+def display():
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+    pygame.event.clear()
+    yield
+    pygame.display.quit()
+
+
+def fixed_clock(now):
+    return lambda: now
+
+
+def test_idle_timeout_without_timers():
+    assert idle_timeout() == IDLE_WAKE_MS
+    assert idle_timeout(Scheduler()) == IDLE_WAKE_MS
+
+
+def test_idle_timeout_rounds_a_pending_timer_up():
+    scheduler = Scheduler(clock=fixed_clock(100.0))
+    scheduler.after(0.3)
+    timeout = idle_timeout(scheduler)
+    assert timeout == 1 and isinstance(timeout, int)
+
+
+def test_idle_timeout_is_capped():
+    scheduler = Scheduler(clock=fixed_clock(0.0))
+    scheduler.after(IDLE_WAKE_MS * 5 + 0.5)
+    assert idle_timeout(scheduler) == IDLE_WAKE_MS
+
+
+def test_idle_timeout_is_zero_while_tweening():
+    scheduler = Scheduler(clock=fixed_clock(0.0))
+    scheduler.tween(100, lambda progress: None)
+    assert idle_timeout(scheduler) == 0
+
+
+# The game loop's idle path: wake, update, sleep again until the timer fires.
+# SDL may wake a little early, which leaves a sub-millisecond wait to round up.
+def test_idle_loop_sleeps_until_a_sub_second_timer(display):
+    scheduler = Scheduler()
+    timer = scheduler.after(20.5)
+    start = time.perf_counter()
+    while not timer.done:
+        assert wait_events(idle_timeout(scheduler)) == []
+        scheduler.update()
+    assert time.perf_counter() - start < IDLE_WAKE_MS / 1000